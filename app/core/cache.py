@@ -0,0 +1,94 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class AggregateCache:
+    """In-process TTL cache for aggregate query results.
+
+    Concurrent misses on the same key share a single in-flight computation
+    (single-flight), so a burst of dashboard polls costs one query.
+    """
+
+    def __init__(self, default_ttl: float, ttls: Optional[Dict[str, float]] = None, enabled: bool = True):
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.enabled = enabled
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, key: str) -> float:
+        return self.ttls.get(key, self.default_ttl)
+
+    def _count(self, key: str, counter: str) -> None:
+        counters = self._counters.setdefault(key, {"hits": 0, "misses": 0, "coalesced": 0})
+        counters[counter] += 1
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        ttl = self.ttl_for(key)
+        if not self.enabled or ttl <= 0:
+            return await compute()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._count(key, "hits")
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self._count(key, "coalesced")
+            return await asyncio.shield(inflight)
+
+        self._count(key, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it here too so an unawaited future doesn't warn
+            future.exception()
+            raise
+        else:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        keys = {}
+        for key, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"] + counters["coalesced"]
+            keys[key] = {
+                **counters,
+                "ttl": self.ttl_for(key),
+                "hit_ratio": round((counters["hits"] + counters["coalesced"]) / lookups, 3) if lookups else 0,
+            }
+        return {
+            "enabled": self.enabled,
+            "hits": sum(c["hits"] for c in self._counters.values()),
+            "misses": sum(c["misses"] for c in self._counters.values()),
+            "coalesced": sum(c["coalesced"] for c in self._counters.values()),
+            "entries": len(self._entries),
+            "keys": keys,
+        }
+
+
+aggregate_cache = AggregateCache(
+    default_ttl=settings.AGGREGATE_CACHE_TTL,
+    ttls={"patients:critical": settings.FRESH_CACHE_TTL, **settings.AGGREGATE_CACHE_TTLS},
+    enabled=settings.AGGREGATE_CACHE_ENABLED,
+)
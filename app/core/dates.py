@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+# Days are calendar days in FACILITY_TIMEZONE. MySQL DATETIME columns hold
+# facility wall-clock time, so SQL gets naive local bounds; MongoDB dates
+# are UTC instants, so Mongo queries get the same bounds converted to UTC.
+
+
+@dataclass(frozen=True)
+class DayWindow:
+    """Half-open [start, end) bounds of one facility day"""
+    day: date
+    start: datetime  # naive facility wall-clock time, for SQL
+    end: datetime
+    utc_start: datetime  # naive UTC, for MongoDB
+    utc_end: datetime
+
+
+class DayWindows:
+    """Day windows in one timezone; today's is computed once per rollover"""
+
+    def __init__(self, tz_name: str):
+        self.tz = ZoneInfo(tz_name)
+        self._today: Optional[DayWindow] = None
+
+    def now(self) -> datetime:
+        """Current facility wall-clock time, naive like the MySQL columns"""
+        return datetime.now(self.tz).replace(tzinfo=None)
+
+    def local(self, moment: datetime) -> datetime:
+        """``moment`` as naive facility wall-clock time; naive input is taken as already local"""
+        if moment.tzinfo is None:
+            return moment
+        return moment.astimezone(self.tz).replace(tzinfo=None)
+
+    def _to_utc(self, local: datetime) -> datetime:
+        return local.replace(tzinfo=self.tz).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def window(self, day: date) -> DayWindow:
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        # A DST change makes the UTC span 23 or 25 hours
+        return DayWindow(day, start, end, self._to_utc(start), self._to_utc(end))
+
+    def today(self) -> DayWindow:
+        window = self._today
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if window is None or not window.utc_start <= now < window.utc_end:
+            window = self._today = self.window(datetime.now(self.tz).date())
+        return window
+
+
+day_windows = DayWindows(settings.FACILITY_TIMEZONE)
+
+
+def facility_today() -> date:
+    return day_windows.today().day
+
+
+def facility_now() -> datetime:
+    return day_windows.now()
+
+
+def facility_time(moment: datetime) -> datetime:
+    """Request datetimes (possibly with an offset) as naive facility time, for SQL"""
+    return day_windows.local(moment)
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) bounds of a facility day, for SQL"""
+    window = day_windows.window(day)
+    return window.start, window.end
+
+
+def today_bounds() -> Tuple[datetime, datetime]:
+    """Half-open [start, end) bounds of the current facility day, for SQL"""
+    window = day_windows.today()
+    return window.start, window.end
+
+
+def utc_day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) bounds of a facility day, for MongoDB"""
+    window = day_windows.window(day)
+    return window.utc_start, window.utc_end
+
+
+def utc_today_bounds() -> Tuple[datetime, datetime]:
+    """Half-open [start, end) bounds of the current facility day, for MongoDB"""
+    window = day_windows.today()
+    return window.utc_start, window.utc_end
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.serialization import ORJSONResponse
+
+
+def etag_for(content: bytes, weak: bool = False) -> str:
+    """Validator derived from ``content``: strong when ``content`` is the whole
+    body, weak (W/) when it is only the part of the body that matters"""
+    tag = '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+    return "W/" + tag if weak else tag
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match matches ``etag``.
+
+    Comparison is weak (RFC 9110 13.1.2): a W/ prefix on either side is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class HTTPCachePolicy:
+    """Cache-Control max-age per route, with a shared default"""
+
+    def __init__(self, default_max_age: int, max_ages: Optional[Dict[str, int]] = None):
+        self.default_max_age = default_max_age
+        self.max_ages = dict(max_ages or {})
+
+    def max_age_for(self, route: str) -> int:
+        return self.max_ages.get(route, self.default_max_age)
+
+    def cache_control(self, route: str) -> str:
+        max_age = self.max_age_for(route)
+        # max-age=0 still lets clients revalidate with If-None-Match
+        return f"max-age={max_age}" if max_age > 0 else "no-cache"
+
+    def respond(self, request: Request, route: str, response: Response, etag: Optional[str] = None) -> Response:
+        """Attach validators to ``response``, or replace it with a 304.
+
+        ``etag`` defaults to a hash of the response body; callers holding a
+        precomputed tag can pass it to skip hashing.
+        """
+        etag = etag or etag_for(response.body)
+        headers = {"ETag": etag, "Cache-Control": self.cache_control(route)}
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return response
+
+    def json(self, request: Request, route: str, content: Any) -> Response:
+        return self.respond(request, route, ORJSONResponse(content))
+
+
+http_cache = HTTPCachePolicy(
+    default_max_age=settings.HTTP_CACHE_MAX_AGE,
+    max_ages=settings.HTTP_CACHE_MAX_AGES,
+)
@@ -0,0 +1,144 @@
+import re
+import time
+from typing import Any, Dict, Tuple
+
+from prometheus_client import Gauge, Histogram
+from pymongo import monitoring
+from sqlalchemy import event
+
+REQUEST_LATENCY = Histogram(
+    "analytics_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+SQL_LATENCY = Histogram(
+    "analytics_sql_statement_duration_seconds",
+    "SQL statement execution latency",
+    ["statement"],
+)
+MONGO_LATENCY = Histogram(
+    "analytics_mongo_command_duration_seconds",
+    "MongoDB command latency",
+    ["command", "collection", "outcome"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "analytics_mysql_pool_checkout_wait_seconds",
+    "Time spent waiting for a MySQL connection from the pool",
+)
+POOL_WAITING = Gauge(
+    "analytics_mysql_pool_waiting",
+    "Callers currently waiting for a MySQL connection from the pool",
+)
+POOL_CONNECTIONS = Gauge(
+    "analytics_mysql_pool_connections",
+    "MySQL pool occupancy: configured size, checked out, idle and overflow connections",
+    ["state"],
+)
+REPLICA_LAG = Gauge(
+    "analytics_mysql_replica_lag_seconds",
+    "Replication lag of each read replica at its last health check",
+    ["replica"],
+)
+REPLICA_HEALTHY = Gauge(
+    "analytics_mysql_replica_healthy",
+    "1 while a read replica is receiving reads, 0 while it is skipped",
+    ["replica"],
+)
+EXECUTOR_QUEUE_WAIT = Histogram(
+    "analytics_mysql_executor_queue_wait_seconds",
+    "Time a query waited for a free MySQL worker thread",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_label(statement: str, limit: int = 160) -> str:
+    # Statements are parameterized, so whitespace-normalized SQL has bounded
+    # cardinality and reads well on a dashboard
+    return _WHITESPACE.sub(" ", statement).strip()[:limit]
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Timing ends when the response body has been sent, so streaming
+    endpoints are measured end to end.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Label by template, never by raw path, to keep cardinality bounded
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """Record per-statement latency for every cursor execution on ``engine``."""
+
+    # The start time lives on the execution context, which is discarded with
+    # the statement, and is taken off it when observed, so a failed execution
+    # is recorded once and leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _observe(context, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        if exception_context.execution_context is not None:
+            _observe(exception_context.execution_context, exception_context.statement)
+
+    def _observe(context, statement):
+        started = context.__dict__.pop("_query_started", None)
+        if started is not None:
+            SQL_LATENCY.labels(statement=statement_label(statement or "")).observe(time.perf_counter() - started)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo command listener feeding MONGO_LATENCY."""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[int, Any], str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            # getMore carries the cursor id there and names the collection separately
+            collection = event.command.get("collection", "")
+        self._collections[(event.request_id, event.connection_id)] = collection
+
+    def _observe(self, event, outcome):
+        collection = self._collections.pop((event.request_id, event.connection_id), "")
+        MONGO_LATENCY.labels(
+            command=event.command_name, collection=collection, outcome=outcome
+        ).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+# datetime, date and UUID are native to orjson; naive datetimes are written
+# without an offset, like datetime.isoformat()
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal):
+        # MySQL SUM()/AVG() results
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize ``value`` to compact JSON, including Mongo and MySQL types"""
+    return orjson.dumps(value, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class for the app.
+
+    Handlers that return a dict still pass through FastAPI's
+    jsonable_encoder first; returning ORJSONResponse(content) directly skips
+    it, which matters for large payloads such as raw Mongo documents.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
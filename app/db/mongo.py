@@ -1,14 +1,57 @@
+import logging
+import time
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
 from app.core.config import settings
+from app.core.metrics import MongoCommandTimer
+
+logger = logging.getLogger(__name__)
 
 _client: AsyncIOMotorClient | None = None
 
+# Staff lookups filter visit_data by staff id plus a scheduledTime range (and
+# sort on it). The Flask app keys staff as nurseId, the FastAPI app as
+# assignedStaffId, so both get a compound index. Whole-day visit streams
+# across all staff range and sort on scheduledTime alone.
+VISIT_DATA_INDEXES = [
+    [("nurseId", ASCENDING), ("scheduledTime", ASCENDING)],
+    [("assignedStaffId", ASCENDING), ("scheduledTime", ASCENDING)],
+    [("scheduledTime", ASCENDING)],
+]
+
 async def get_mongo_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(settings.MONGODB_URI)
+        listeners = [MongoCommandTimer()] if settings.METRICS_ENABLED else []
+        _client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=listeners)
     return _client
 
 async def get_mongo_db():
     client = await get_mongo_client()
     return client[settings.MONGODB_DB]
+
+async def ensure_visit_data_indexes() -> None:
+    """Create the visit_data indexes if missing, logging each one's state."""
+    db = await get_mongo_db()
+    collection = db.visit_data
+    try:
+        existing = await collection.index_information()
+    except Exception as e:
+        logger.warning("visit_data index check skipped: %s", e)
+        return
+
+    for keys in VISIT_DATA_INDEXES:
+        present = next((name for name, info in existing.items() if info.get("key") == keys), None)
+        if present:
+            logger.info("visit_data index %s: ready", present)
+            continue
+
+        logger.info("visit_data index on %s: building", [k for k, _ in keys])
+        started = time.monotonic()
+        try:
+            name = await collection.create_index(keys)
+        except Exception as e:
+            logger.error("visit_data index on %s: build failed: %s", [k for k, _ in keys], e)
+            continue
+        logger.info("visit_data index %s: ready (built in %.1fs)", name, time.monotonic() - started)
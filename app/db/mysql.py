@@ -1,17 +1,170 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.metrics import EXECUTOR_QUEUE_WAIT
+from app.db.engine import create_mysql_engine
+from app.db.replicas import ReplicaRouter
 
-engine = create_engine(
-    settings.MYSQL_DSN,
-    pool_pre_ping=True,
-)
+T = TypeVar("T")
+
+engine = create_mysql_engine(settings.MYSQL_DSN)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only analytics queries go to these when MYSQL_REPLICA_DSNS is set;
+# writes and the counter scans stay on the primary
+replicas = ReplicaRouter(
+    settings.MYSQL_REPLICA_DSNS,
+    lambda dsn: create_mysql_engine(dsn, track_pool=False),
+    max_lag=settings.MYSQL_REPLICA_MAX_LAG,
+    check_interval=settings.MYSQL_REPLICA_CHECK_INTERVAL,
+)
+
+# Blocking driver calls run here instead of on the event loop. One worker per
+# pooled connection, so concurrent requests overlap their I/O.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.MYSQL_POOL_SIZE,
+    thread_name_prefix="mysql",
+)
+
 def get_mysql_session():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def _call_with_session(fn: Callable[..., T], args: tuple, submitted: float) -> T:
+    EXECUTOR_QUEUE_WAIT.observe(time.perf_counter() - submitted)
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+async def run_in_session(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn(db, *args)`` with a fresh session on the MySQL worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _call_with_session, fn, args, time.perf_counter())
+
+def read_session(max_lag: Optional[float] = None) -> Session:
+    """Session on a healthy replica at most ``max_lag`` seconds behind, else on the primary"""
+    replica = replicas.choose(max_lag)
+    return SessionLocal() if replica is None else replica.sessions()
+
+def session_lag(db: Session) -> Optional[float]:
+    """How far behind the primary ``db`` may be reading, in seconds; None when unknown"""
+    return replicas.lag_of(db.get_bind())
+
+# MySQL client errors for a server that can't be reached or dropped the
+# connection: CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST.
+# Lock waits, deadlocks and statement timeouts are OperationalErrors too,
+# but the primary would fail them the same way.
+CONNECTION_LOST_CODES = {2003, 2006, 2013}
+
+def _connection_lost(error: DBAPIError) -> bool:
+    if error.connection_invalidated:
+        return True
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in CONNECTION_LOST_CODES
+
+def _call_with_read_session(fn: Callable[..., T], args: tuple, max_lag: Optional[float], submitted: float) -> T:
+    EXECUTOR_QUEUE_WAIT.observe(time.perf_counter() - submitted)
+    replica = replicas.choose(max_lag)
+    if replica is not None:
+        db = replica.sessions()
+        try:
+            return fn(db, *args)
+        except DBAPIError as e:
+            if not _connection_lost(e):
+                raise
+            replicas.mark_down(replica, e)
+        finally:
+            db.close()
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+async def run_in_read_session(fn: Callable[..., T], *args: Any, max_lag: Optional[float] = None) -> T:
+    """Like ``run_in_session`` for read-only ``fn``, on a replica when one is eligible.
+
+    A replica that fails with a connection error is taken out of rotation
+    and the query is retried once on the primary.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, _call_with_read_session, fn, args, max_lag, time.perf_counter())
+
+async def stream_in_session(statement, params: Optional[Dict[str, Any]] = None, chunk_size: int = 500,
+                            session_factory: Callable[[], Session] = SessionLocal) -> AsyncIterator[Sequence[Any]]:
+    """Yield result rows in chunks of ``chunk_size`` from a server-side cursor.
+
+    The session keeps its connection until the generator is exhausted or
+    closed, but the worker pool is only held while a chunk is fetched, so a
+    slow client doesn't starve other requests of workers.
+    """
+    loop = asyncio.get_running_loop()
+    db = session_factory()
+    try:
+        result = await loop.run_in_executor(_executor, lambda: db.execute(
+            statement, params or {}, execution_options={"stream_results": True}))
+        while True:
+            rows = await loop.run_in_executor(_executor, result.fetchmany, chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        await loop.run_in_executor(_executor, db.close)
+
+# Indexes the analytics queries rely on: (name, table, columns)
+ANALYTICS_INDEXES = [
+    ("ix_visits_scheduled_time", "visits", ("scheduled_time",)),
+    ("ix_visits_status", "visits", ("status",)),
+    ("ix_patients_status", "patients", ("status",)),
+    # Delta scans for the materialized status counters
+    ("ix_visits_updated_at", "visits", ("updated_at",)),
+    ("ix_patients_updated_at", "patients", ("updated_at",)),
+]
+
+def ensure_indexes(bind) -> List[str]:
+    """Create any missing analytics index and return the names created.
+
+    An existing index counts as present when it has the same name or leads
+    with the same columns, so re-running against a tuned schema is a no-op.
+    """
+    inspector = inspect(bind)
+    created = []
+    for name, table, columns in ANALYTICS_INDEXES:
+        existing = inspector.get_indexes(table)
+        if any(ix["name"] == name or tuple(ix["column_names"][:len(columns)]) == columns for ix in existing):
+            continue
+        with bind.begin() as conn:
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+        created.append(name)
+    return created
+
+def explain_index(bind, statement: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the index the database plans to use for ``statement``, if any."""
+    params = params or {}
+    with bind.connect() as conn:
+        if bind.dialect.name == "sqlite":
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {statement}"), params).fetchall()
+            for row in plan:
+                match = re.search(r"USING (?:COVERING )?INDEX (\w+)", row[-1])
+                if match:
+                    return match.group(1)
+            return None
+        plan = conn.execute(text(f"EXPLAIN {statement}"), params).mappings().fetchall()
+        for row in plan:
+            if row.get("key"):
+                return row["key"]
+        return None
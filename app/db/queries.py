@@ -0,0 +1,56 @@
+from sqlalchemy import DateTime, bindparam, text
+
+# Every fixed analytics statement, shared by the FastAPI services and the
+# legacy Flask app. Built once at import: SQLAlchemy keys its compiled cache
+# (MYSQL_QUERY_CACHE_SIZE) on the construct, so executing these skips SQL
+# compilation after the first use on each engine.
+#
+# PyMySQL interpolates parameters client side and has no server-side
+# prepared statements; the fixed statement text is what the driver and
+# server see every time.
+
+# Half-open range on the bare column so ix_visits_scheduled_time can serve it
+TODAY_VISITS_PREDICATE = "scheduled_time >= :today_start AND scheduled_time < :today_end"
+TODAY_VISITS_SQL = f"SELECT COUNT(*) FROM visits WHERE {TODAY_VISITS_PREDICATE}"
+
+PATIENT_TOTAL = text("SELECT COUNT(*) FROM patients")
+VISIT_TOTAL = text("SELECT COUNT(*) FROM visits")
+TODAY_VISITS = text(TODAY_VISITS_SQL)
+CRITICAL_PATIENTS = text("SELECT COUNT(*) FROM patients WHERE status = 'Critical'")
+
+PATIENT_STATUS_COUNTS = text("SELECT status, COUNT(*) AS count FROM patients GROUP BY status")
+VISIT_STATUS_COUNTS = text("SELECT status, COUNT(*) AS count FROM visits GROUP BY status")
+
+# Both halves of the UNION are index scans: ix_visits_status for the grouped
+# counts, ix_visits_scheduled_time for today's range
+VISIT_STATUS_AND_TODAY_COUNTS = text(f"""
+    SELECT 'status' AS kind, status, COUNT(*) AS count
+    FROM visits
+    GROUP BY status
+    UNION ALL
+    SELECT 'today' AS kind, NULL, COUNT(*)
+    FROM visits
+    WHERE {TODAY_VISITS_PREDICATE}
+""")
+
+# Status counter scans, per table
+
+COUNTER_TABLES = ("patients", "visits")
+
+STATUS_ROWS = {
+    table: text(f"SELECT id, status, updated_at FROM {table}").columns(updated_at=DateTime)
+    for table in COUNTER_TABLES
+}
+
+# Served by ix_<table>_updated_at
+STATUS_ROWS_SINCE = {
+    table: text(f"SELECT id, status, updated_at FROM {table} WHERE updated_at >= :since")
+    .bindparams(bindparam("since", type_=DateTime))
+    .columns(updated_at=DateTime)
+    for table in COUNTER_TABLES
+}
+
+STATUS_COUNTS = {
+    "patients": PATIENT_STATUS_COUNTS,
+    "visits": VISIT_STATUS_COUNTS,
+}
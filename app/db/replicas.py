@@ -0,0 +1,162 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.metrics import REPLICA_HEALTHY, REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+# MySQL 8.0.22 renamed SHOW SLAVE STATUS and its Seconds_Behind_Master column
+STATUS_STATEMENTS = ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS")
+LAG_COLUMNS = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+
+
+def replication_lag(conn: Connection) -> Optional[float]:
+    """Seconds the server is behind its source; None when replication is stopped.
+
+    Servers that replicate from nothing (and SQLite stand-ins) report 0.
+    Needs the REPLICATION CLIENT privilege on MySQL.
+    """
+    if conn.dialect.name != "mysql":
+        conn.execute(text("SELECT 1"))
+        return 0.0
+    for statement in STATUS_STATEMENTS:
+        try:
+            row = conn.execute(text(statement)).mappings().first()
+        except DBAPIError:
+            if statement == STATUS_STATEMENTS[-1]:
+                raise
+            continue
+        break
+    if row is None:
+        return 0.0
+    lag = next((row[column] for column in LAG_COLUMNS if column in row), 0)
+    return None if lag is None else float(lag)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    sessions: sessionmaker
+    healthy: bool = False  # unknown until the first check passes
+    lag: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = field(default=None, repr=False)
+
+    def lag_bound(self) -> Optional[float]:
+        """Upper bound on the lag right now: the last sample plus its age.
+        None while the replica is down or unchecked."""
+        if not self.healthy or self.lag is None or self.checked_at is None:
+            return None
+        return self.lag + (time.monotonic() - self.checked_at)
+
+    def state(self) -> Dict[str, Any]:
+        return {"name": self.name, "healthy": self.healthy, "lag": self.lag, "error": self.error}
+
+
+class ReplicaRouter:
+    """Spreads read-only sessions over healthy replicas.
+
+    A background check measures each replica's replication lag every
+    ``check_interval`` seconds; replicas that fail the check, stop
+    replicating or fall more than ``max_lag`` seconds behind get no reads
+    until a later check passes. With no eligible replica, reads go to the
+    primary.
+    """
+
+    def __init__(self, dsns: List[str], engine_factory: Callable[[str], Engine],
+                 max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas = [self._replica(dsn, engine_factory) for dsn in dsns]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _replica(dsn: str, engine_factory: Callable[[str], Engine]) -> Replica:
+        url = make_url(dsn)
+        name = f"{url.host or 'local'}:{url.port or ''}/{url.database or ''}"
+        engine = engine_factory(dsn)
+        return Replica(name, engine, sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+    def choose(self, max_lag: Optional[float] = None) -> Optional[Replica]:
+        """Next healthy replica (round robin) within ``max_lag`` seconds of the
+        primary, or None for the primary.
+
+        Judged by ``lag_bound``, so a replica only qualifies while its last
+        sample is recent enough to prove the limit; with a limit below the
+        check interval it serves reads only for a moment after each check.
+        """
+        limit = self.max_lag if max_lag is None else min(max_lag, self.max_lag)
+        bounds = [(r, r.lag_bound()) for r in self.replicas]
+        eligible = [r for r, bound in bounds if bound is not None and bound <= limit]
+        if not eligible:
+            return None
+        with self._lock:
+            turn = next(self._turn)
+        return eligible[turn % len(eligible)]
+
+    def lag_of(self, bind) -> Optional[float]:
+        """Lag bound of the replica behind ``bind``; 0 for any other engine (the primary)"""
+        for replica in self.replicas:
+            if replica.engine is bind:
+                return replica.lag_bound()
+        return 0.0
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        """Take ``replica`` out of rotation until its next passing check"""
+        replica.healthy = False
+        replica.error = str(error)
+        REPLICA_HEALTHY.labels(replica=replica.name).set(0)
+        logger.warning("replica %s marked down: %s", replica.name, error)
+
+    def check(self, replica: Replica) -> None:
+        """Blocking health and lag check of one replica"""
+        try:
+            with replica.engine.connect() as conn:
+                lag = replication_lag(conn)
+        except Exception as e:
+            replica.lag, replica.healthy, replica.error = None, False, str(e)
+        else:
+            replica.lag = lag
+            replica.healthy = lag is not None and lag <= self.max_lag
+            replica.error = None if lag is not None else "replication stopped"
+        replica.checked_at = time.monotonic()
+        REPLICA_HEALTHY.labels(replica=replica.name).set(int(replica.healthy))
+        if replica.lag is not None:
+            REPLICA_LAG.labels(replica=replica.name).set(replica.lag)
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            self.check(replica)
+
+    def state(self) -> List[Dict[str, Any]]:
+        return [replica.state() for replica in self.replicas]
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Off the MySQL worker pool so a hung replica can't starve queries
+            await loop.run_in_executor(None, self.check_all)
+            await asyncio.sleep(self.check_interval)
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class VisitFields:
+    """Where staff, task and completion data live in a visit_data document."""
+
+    staff: str
+    tasks: str
+    task_done: str
+    task_done_value: Any
+    task_priority: str
+
+    def task_projection(self) -> Dict[str, int]:
+        # Task details returned by the visit listings
+        return {
+            f"{self.tasks}.taskTitle": 1,
+            f"{self.tasks}.{self.task_done}": 1,
+            f"{self.tasks}.{self.task_priority}": 1,
+            f"{self.tasks}.taskCategory": 1,
+        }
+
+
+visit_fields = VisitFields(
+    staff=settings.VISIT_STAFF_FIELD,
+    tasks=settings.VISIT_TASKS_FIELD,
+    task_done=settings.VISIT_TASK_DONE_FIELD,
+    task_done_value=settings.VISIT_TASK_DONE_VALUE,
+    task_priority=settings.VISIT_TASK_PRIORITY_FIELD,
+)
+
+# The two schemas in use today
+FASTAPI_FIELDS = VisitFields("assignedStaffId", "tasks", "status", "completed", "priority")
+FLASK_FIELDS = VisitFields("nurseId", "taskCompletions", "completed", True, "priority")
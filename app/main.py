@@ -1,12 +1,60 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.routers.analytics import router as analytics_router
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.serialization import ORJSONResponse
+from app.db.mongo import ensure_visit_data_indexes, get_mongo_db
+from app.db.mysql import replicas
+from app.services.columnar import columnar_engine
+from app.services.counters import CounterMaintainer
+from app.services.live import live_updates
+from app.services.rollups import prepare_rollup_tables
+from app.services.snapshots import payload_snapshots
+
+logging.basicConfig(level=logging.DEBUG if settings.DEBUG else logging.INFO)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if settings.MONGO_ENSURE_INDEXES:
+        # Builds can take a while on a large collection; don't hold up startup
+        tasks.append(asyncio.create_task(ensure_visit_data_indexes()))
+    if settings.ROLLUP_CREATE_TABLES:
+        tasks.append(asyncio.create_task(prepare_rollup_tables()))
+    # Replicas get reads once their first check passes
+    replicas.start()
+    counters = None
+    if settings.STATUS_COUNTERS_ENABLED:
+        counters = CounterMaintainer()
+        counters.start()
+    if settings.SNAPSHOT_ENABLED:
+        payload_snapshots.start()
+    if settings.COLUMNAR_ENABLED:
+        columnar_engine.start()
+    if settings.LIVE_ENABLED:
+        live_updates.start(await get_mongo_db(), watch=settings.LIVE_WATCH_VISIT_DATA)
+    yield
+    for task in tasks:
+        task.cancel()
+    if counters is not None:
+        await counters.stop()
+    await payload_snapshots.stop()
+    await columnar_engine.stop()
+    await live_updates.stop()
+    await replicas.stop()
 
 app = FastAPI(
     title="Analytics Service API",
     description="Aggregates analytics from MySQL and MongoDB",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -18,6 +66,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health", tags=["Health"])
 async def health():
     return {"status": "ok", "service": "analytics-service"}
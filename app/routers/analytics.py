@@ -1,160 +1,298 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.mysql import get_mysql_session
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from app.core.cache import aggregate_cache
+from app.core.config import settings
+from app.core.dates import facility_now, facility_time, facility_today, utc_today_bounds
+from app.core.http_cache import http_cache
+from app.core.serialization import ORJSONResponse
 from app.db.mongo import get_mongo_db
+from app.db.mysql import replicas
+from app.services import aggregates
+from app.services.columnar import DIMENSIONS, columnar_engine, visit_breakdown
+from app.services.counters import status_counters
+from app.services.live import live_updates
+from app.services.listings import patient_key, patient_page_query, stream_page, visit_key, visit_page_query
+from app.services.snapshots import payload_snapshots
+from app.services.staff_days import staff_task_range
+from app.services.rollups import staff_task_daily, visit_daily
+from app.services.timeseries import visit_timeseries
+from app.services.staff_tasks import batch_task_summary_pipeline, task_summary, task_summary_pipeline
+from app.services.visits import stream_visits_ndjson, visit_projection, visits_query
 
 router = APIRouter()
 
+class StaffTasksBatchRequest(BaseModel):
+    staffIds: List[str] = Field(..., min_length=1, max_length=500)
+
+PageSize = Query(settings.LISTING_PAGE_SIZE, ge=1, le=settings.LISTING_MAX_PAGE_SIZE)
+
+def bad_request(message: str) -> ORJSONResponse:
+    return ORJSONResponse({"error": message, "data": None}, status_code=400)
+
+@router.get("/patients")
+async def list_patients(
+    status: Optional[str] = None,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = PageSize,
+):
+    # Patients in id order, optionally filtered by status and an updated_at
+    # range; pass next_cursor back as cursor for the following page
+    try:
+        statement, params = patient_page_query(status, start, end, cursor, limit)
+    except Exception as e:
+        return bad_request(str(e))
+    return StreamingResponse(stream_page(statement, params, limit, patient_key), media_type="application/json")
+
+@router.get("/visits")
+async def list_visits(
+    status: Optional[str] = None,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = PageSize,
+):
+    # Visits in (scheduled_time, id) order, optionally filtered by status and
+    # a scheduled_time range; pass next_cursor back as cursor for the
+    # following page
+    try:
+        statement, params = visit_page_query(status, start, end, cursor, limit)
+    except Exception as e:
+        return bad_request(str(e))
+    return StreamingResponse(stream_page(statement, params, limit, visit_key), media_type="application/json")
+
 @router.get("/patients/summary")
-async def patients_summary(db: Session = Depends(get_mysql_session)):
-    # Get patient count by status from MySQL
-    result = db.execute("SELECT status, COUNT(*) as count FROM patients GROUP BY status")
-    rows = [{"status": r[0], "count": int(r[1])} for r in result]
-    return {"data": rows}
+async def patients_summary(request: Request):
+    rows = await aggregates.patient_status_counts()
+    return http_cache.json(request, "/patients/summary", {"data": rows})
 
 @router.get("/visits/summary")
-async def visits_summary(db: Session = Depends(get_mysql_session)):
-    # Get visits summary from MySQL visits table
-    result = db.execute("SELECT status, COUNT(*) as count FROM visits GROUP BY status")
-    rows = [{"status": r[0], "count": int(r[1])} for r in result]
-    return {"data": rows}
+async def visits_summary(request: Request):
+    counts = await aggregates.visit_status_counts()
+    return http_cache.json(request, "/visits/summary", {"data": counts["by_status"]})
+
+@router.get("/visits/timeseries")
+async def visits_timeseries(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    bucket: Literal["hour", "day", "week"] = "day",
+    status: Optional[str] = None,
+):
+    # Visit counts per bucket of scheduled_time; defaults to the last 30 days.
+    # from/to are widened to whole buckets; offsets are converted to facility time.
+    try:
+        end = facility_time(end) if end else facility_now()
+        start = facility_time(start) if start else end - timedelta(days=30)
+        if start > end:
+            return bad_request("from must not be after to")
+        rows = await visit_timeseries(start, end, bucket, status)
+        return {"data": rows}
+        
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.get("/visits/daily")
+async def visits_daily(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    status: Optional[str] = None,
+):
+    # Per-day, per-status visit counts for [from, to) from the daily rollups
+    # plus a raw scan of the days not rolled up yet. Defaults to the last 30
+    # days including today.
+    try:
+        end = end or facility_today() + timedelta(days=1)
+        start = start or end - timedelta(days=30)
+        rows = await visit_daily(start, end, status)
+        return {"data": rows}
+        
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.get("/visits/breakdown")
+async def visits_breakdown(
+    by: str = "status",
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    status: Optional[str] = None,
+    patient_status: Optional[str] = None,
+):
+    # Ad-hoc visit counts grouped by a comma-separated list of dimensions,
+    # answered from the in-memory columnar snapshot without touching MySQL
+    try:
+        dimensions = [d.strip() for d in by.split(",") if d.strip()]
+        unknown = [d for d in dimensions if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"unknown dimensions {unknown}; expected any of {list(DIMENSIONS)}")
+        snapshot = columnar_engine.snapshot
+        if snapshot is None:
+            raise RuntimeError("columnar snapshot not loaded (COLUMNAR_ENABLED is off or loading)")
+        rows = await visit_breakdown(snapshot, dimensions, start, end, status, patient_status)
+        return {"data": rows, "snapshot_at": snapshot.loaded_at}
+        
+    except Exception as e:
+        return {"error": str(e), "data": None}
 
 @router.get("/patients/critical")
-async def patients_critical(db: Session = Depends(get_mysql_session)):
-    # Get count of patients with critical status
-    result = db.execute("SELECT COUNT(*) as count FROM patients WHERE status = 'Critical'")
-    count = result.scalar() or 0
-    return {"data": {"critical_patients": int(count)}}
+async def patients_critical():
+    # Triage screens need a current count: never older than MYSQL_FRESH_MAX_LAG
+    count = await aggregates.critical_patients(max_lag=settings.MYSQL_FRESH_MAX_LAG)
+    return {"data": {"critical_patients": count}}
 
 @router.get("/performance")
-async def performance(db: Session = Depends(get_mysql_session)):
-    # Get comprehensive stats from MySQL
-    patient_total = db.execute("SELECT COUNT(*) FROM patients").scalar() or 0
-    visit_total = db.execute("SELECT COUNT(*) FROM visits").scalar() or 0
-    
-    # Get today's visits
-    today_visits = db.execute("""
-        SELECT COUNT(*) FROM visits 
-        WHERE DATE(scheduled_time) = CURDATE()
-    """).scalar() or 0
-    
-    # Get critical patients
-    critical_patients = db.execute("""
-        SELECT COUNT(*) FROM patients 
-        WHERE status = 'Critical'
-    """).scalar() or 0
-    
-    return {"data": {
-        "patients": int(patient_total),
-        "visits": int(visit_total),
-        "today_visits": int(today_visits),
-        "critical_patients": int(critical_patients)
-    }}
+async def performance():
+    # Served from the precomputed snapshot; computed live when it is stale
+    snapshot = payload_snapshots.fresh("performance") or await payload_snapshots.refresh("performance")
+    return snapshot.response()
 
 @router.get("/dashboard/stats")
-async def dashboard_stats(db: Session = Depends(get_mysql_session)):
+async def dashboard_stats(request: Request):
     # Get all dashboard statistics in one call
     try:
-        # Total patients
-        total_patients = db.execute("SELECT COUNT(*) FROM patients").scalar() or 0
-        
-        # Total visits
-        total_visits = db.execute("SELECT COUNT(*) FROM visits").scalar() or 0
-        
-        # Today's visits
-        today_visits = db.execute("""
-            SELECT COUNT(*) FROM visits 
-            WHERE DATE(scheduled_time) = CURDATE()
-        """).scalar() or 0
-        
-        # Critical patients
-        critical_patients = db.execute("""
-            SELECT COUNT(*) FROM patients 
-            WHERE status = 'Critical'
-        """).scalar() or 0
-        
-        # Patients by status
-        patients_by_status = db.execute("""
-            SELECT status, COUNT(*) as count 
-            FROM patients 
-            GROUP BY status
-        """)
-        patient_status_data = [{"status": r[0], "count": int(r[1])} for r in patients_by_status]
-        
-        # Visits by status
-        visits_by_status = db.execute("""
-            SELECT status, COUNT(*) as count 
-            FROM visits 
-            GROUP BY status
-        """)
-        visit_status_data = [{"status": r[0], "count": int(r[1])} for r in visits_by_status]
-        
-        return {"data": {
-            "overview": {
-                "total_patients": int(total_patients),
-                "total_visits": int(total_visits),
-                "today_visits": int(today_visits),
-                "critical_patients": int(critical_patients)
-            },
-            "patients_by_status": patient_status_data,
-            "visits_by_status": visit_status_data
-        }}
+        # A fresh snapshot carries its ETag, so a matching poll is answered
+        # without querying or hashing
+        snapshot = payload_snapshots.fresh("dashboard") or await payload_snapshots.refresh("dashboard")
+        return http_cache.respond(request, "/dashboard/stats", snapshot.response(), etag=snapshot.etag)
         
     except Exception as e:
         return {"error": str(e), "data": None}
 
+@router.get("/stream")
+async def live_stream():
+    # Server-Sent Events: a snapshot of the dashboard state, then merge
+    # patches as it changes. Every client shares one background producer.
+    if not settings.LIVE_ENABLED:
+        return {"error": "live updates are disabled (LIVE_ENABLED is off)", "data": None}
+    return StreamingResponse(
+        live_updates.events(settings.LIVE_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/cache/stats")
+async def cache_stats():
+    # Hit/miss counters per cache key, for tuning AGGREGATE_CACHE_TTLS
+    return {"data": aggregate_cache.stats()}
+
+@router.get("/counters")
+async def counters_state():
+    # Materialized status counters with their watermark and last drift check
+    return {"data": {name: counter.state() for name, counter in status_counters.items()}}
+
+@router.get("/replicas")
+async def replicas_state():
+    # Read replicas with their lag and health as of the last check
+    return {"data": replicas.state()}
+
 @router.get("/staff/{staff_id}/tasks/today")
 async def staff_tasks_today(staff_id: str, mongo_db = Depends(get_mongo_db)):
     # Get staff tasks for today from MongoDB visit_data collection
     try:
-        from datetime import datetime, timedelta
+        today_start, today_end = utc_today_bounds()
+        
+        # Count tasks server-side; only the counters come back over the wire
+        pipeline = task_summary_pipeline(staff_id, today_start, today_end)
+        result = await mongo_db.visit_data.aggregate(pipeline).to_list(length=1)
+        
+        return {"data": task_summary(result[0] if result else None)}
+        
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.get("/staff/{staff_id}/tasks")
+async def staff_tasks_range(
+    staff_id: str,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    mongo_db = Depends(get_mongo_db),
+):
+    # Task summary over [from, to), e.g. a week or a month. Settled past days
+    # are read from the per-day cache, recent days and today are computed
+    # live. Defaults to the last 7 days including today.
+    try:
+        end = end or facility_today() + timedelta(days=1)
+        start = start or end - timedelta(days=7)
+        if start > end:
+            return bad_request("from must not be after to")
+        summary = await staff_task_range(mongo_db, staff_id, start, end)
+        return {"data": summary}
         
-        # Get today's date range
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.get("/staff/{staff_id}/tasks/daily")
+async def staff_tasks_daily(
+    staff_id: str,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    mongo_db = Depends(get_mongo_db),
+):
+    # Per-day task summaries for [from, to), rolled-up days from MySQL and the
+    # rest from visit_data. Defaults to the last 30 days including today.
+    try:
+        end = end or facility_today() + timedelta(days=1)
+        start = start or end - timedelta(days=30)
+        rows = await staff_task_daily(mongo_db, staff_id, start, end)
+        return {"data": rows}
         
-        # Query MongoDB for visits assigned to this staff member today
-        visits_collection = mongo_db.visit_data
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.post("/staff/tasks/today")
+async def staff_tasks_today_batch(request: StaffTasksBatchRequest, mongo_db = Depends(get_mongo_db)):
+    # Task summaries for many staff members from a single aggregation
+    try:
+        today_start, today_end = utc_today_bounds()
         
-        # Find all visits for this staff member today
-        visits = list(visits_collection.find({
-            "assignedStaffId": staff_id,
-            "scheduledTime": {
-                "$gte": today_start,
-                "$lt": today_end
-            }
-        }))
+        staff_ids = list(dict.fromkeys(request.staffIds))
+        pipeline = batch_task_summary_pipeline(staff_ids, today_start, today_end)
+        counts = {doc["_id"]: doc async for doc in mongo_db.visit_data.aggregate(pipeline)}
         
-        # Calculate task statistics
-        total_tasks = 0
-        completed_tasks = 0
-        pending_tasks = 0
-        high_priority_pending = 0
-        total_visits = len(visits)
+        # Staff with no visits today get zeroed counters
+        return {"data": {staff_id: task_summary(counts.get(staff_id)) for staff_id in staff_ids}}
         
-        for visit in visits:
-            tasks = visit.get("tasks", [])
-            total_tasks += len(tasks)
-            
-            for task in tasks:
-                if task.get("status") == "completed":
-                    completed_tasks += 1
-                else:
-                    pending_tasks += 1
-                    if task.get("priority") == "high":
-                        high_priority_pending += 1
+    except Exception as e:
+        return {"error": str(e), "data": None}
+
+@router.get("/staff/{staff_id}/visits/today")
+async def staff_visits_today(staff_id: str, mongo_db = Depends(get_mongo_db)):
+    # Get today's visits for a specific staff member with task details
+    try:
+        today_start, today_end = utc_today_bounds()
         
-        # Calculate completion rate
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        cursor = mongo_db.visit_data.find(
+            visits_query(today_start, today_end, staff_id),
+            visit_projection()
+        ).sort("scheduledTime", 1)
+        visits = await cursor.to_list(length=None)
         
-        return {"data": {
-            "totalTasks": total_tasks,
-            "completedTasks": completed_tasks,
-            "pendingTasks": pending_tasks,
-            "highPriorityPending": high_priority_pending,
-            "totalVisits": total_visits,
-            "completionRate": round(completion_rate, 1)
-        }}
+        # Serialized directly (ObjectId and datetime included), skipping
+        # jsonable_encoder's per-field walk over every document
+        return ORJSONResponse({"data": visits})
         
     except Exception as e:
         return {"error": str(e), "data": None}
+
+def visits_today_ndjson(mongo_db, staff_id: Optional[str]) -> StreamingResponse:
+    today_start, today_end = utc_today_bounds()
+    query = visits_query(today_start, today_end, staff_id)
+    return StreamingResponse(
+        stream_visits_ndjson(mongo_db.visit_data, query),
+        media_type="application/x-ndjson",
+    )
+
+@router.get("/visits/today/stream")
+async def visits_today_stream(staffId: Optional[str] = None, mongo_db = Depends(get_mongo_db)):
+    # Stream today's visits as NDJSON across all staff (or one, with
+    # ?staffId=) without materializing the result
+    return visits_today_ndjson(mongo_db, staffId)
+
+@router.get("/staff/{staff_id}/visits/today/stream")
+async def staff_visits_today_stream(staff_id: str, mongo_db = Depends(get_mongo_db)):
+    # Stream one staff member's visits today as NDJSON
+    return visits_today_ndjson(mongo_db, staff_id)
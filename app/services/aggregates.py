@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import aggregate_cache
+from app.core.config import settings
+from app.core.dates import today_bounds
+from app.db import queries
+from app.db.mysql import run_in_read_session, session_lag
+from app.services.counters import ready_counts, ready_counts_as_of
+
+PATIENT_STATUS_COUNTS = "patients:status_counts"
+CRITICAL_PATIENTS = "patients:critical"
+VISIT_STATUS_COUNTS = "visits:status_counts"
+TODAY_VISITS = "visits:today_count"
+
+# Blocking query bodies, run through run_in_read_session
+
+def query_patient_status_counts(db: Session) -> List[Dict]:
+    result = db.execute(queries.PATIENT_STATUS_COUNTS)
+    return [{"status": r[0], "count": int(r[1])} for r in result]
+
+def query_critical_patients(db: Session) -> int:
+    return int(db.execute(queries.CRITICAL_PATIENTS).scalar() or 0)
+
+def query_visit_status_counts(db: Session) -> Dict:
+    today_start, today_end = today_bounds()
+    result = db.execute(queries.VISIT_STATUS_AND_TODAY_COUNTS, {"today_start": today_start, "today_end": today_end})
+    counts = {"by_status": [], "today": 0}
+    for kind, status, count in result:
+        if kind == "today":
+            counts["today"] = int(count)
+        else:
+            counts["by_status"].append({"status": status, "count": int(count)})
+    return counts
+
+def query_today_visits(db: Session) -> int:
+    today_start, today_end = today_bounds()
+    result = db.execute(queries.TODAY_VISITS, {"today_start": today_start, "today_end": today_end})
+    return int(result.scalar() or 0)
+
+# Accessors shared by every endpoint that needs status counts. Materialized
+# counters answer in O(#statuses) once seeded; until then (or when disabled)
+# the cached GROUP BY queries do, on a replica when one is eligible.
+
+async def patient_status_counts() -> List[Dict]:
+    counts = ready_counts("patients")
+    if counts is not None:
+        return counts
+    return await aggregate_cache.get_or_compute(
+        PATIENT_STATUS_COUNTS, lambda: run_in_read_session(query_patient_status_counts)
+    )
+
+async def critical_patients(max_lag: float) -> int:
+    """Critical patients as of at most ``max_lag`` seconds ago.
+
+    Skips the counters (up to a delta interval behind). The index-served
+    count is cached for a fraction of a second so concurrent polls share
+    one query, and the replica must be within what is left of ``max_lag``.
+    """
+    ttl = max(aggregate_cache.ttl_for(CRITICAL_PATIENTS), 0.0)
+    replica_lag = max(max_lag - ttl, 0.0)
+    return await aggregate_cache.get_or_compute(
+        CRITICAL_PATIENTS, lambda: run_in_read_session(query_critical_patients, max_lag=replica_lag)
+    )
+
+async def visit_status_counts() -> Dict:
+    counts = ready_counts("visits")
+    if counts is not None:
+        today = await aggregate_cache.get_or_compute(
+            TODAY_VISITS, lambda: run_in_read_session(query_today_visits)
+        )
+        return {"by_status": counts, "today": today}
+    return await aggregate_cache.get_or_compute(
+        VISIT_STATUS_COUNTS, lambda: run_in_read_session(query_visit_status_counts)
+    )
+
+# Payload builders
+
+def critical_count(patient_rows: List[Dict]) -> int:
+    # MySQL compares status case-insensitively, so match 'Critical' the same way
+    return sum(
+        r["count"] for r in patient_rows
+        if r["status"] is not None and r["status"].lower() == "critical"
+    )
+
+def build_performance(patient_rows: List[Dict], visit_counts: Dict) -> Dict:
+    return {
+        "patients": sum(r["count"] for r in patient_rows),
+        "visits": sum(r["count"] for r in visit_counts["by_status"]),
+        "today_visits": visit_counts["today"],
+        "critical_patients": critical_count(patient_rows)
+    }
+
+def build_dashboard(patient_rows: List[Dict], visit_counts: Dict) -> Dict:
+    return {
+        "overview": {
+            "total_patients": sum(r["count"] for r in patient_rows),
+            "total_visits": sum(r["count"] for r in visit_counts["by_status"]),
+            "today_visits": visit_counts["today"],
+            "critical_patients": critical_count(patient_rows)
+        },
+        "patients_by_status": patient_rows,
+        "visits_by_status": visit_counts["by_status"]
+    }
+
+async def dashboard_payload() -> Dict:
+    patient_rows, visit_counts = await asyncio.gather(patient_status_counts(), visit_status_counts())
+    return build_dashboard(patient_rows, visit_counts)
+
+def query_dashboard_stats(db: Session) -> Dict:
+    """Uncached dashboard payload from a single session"""
+    return build_dashboard(query_patient_status_counts(db), query_visit_status_counts(db))
+
+# Snapshot producers: the same payloads read past the aggregate cache and
+# stamped with the oldest moment their inputs reflect, so generated_at never
+# overstates how current a snapshot is
+
+def query_snapshot_counts(db: Session) -> Tuple[List[Dict], Dict, datetime]:
+    """Patient and visit counts from the counters when seeded, else from
+    ``db``, and the moment they reflect: the counters' last sync or the
+    read less the session's replica lag"""
+    lag = session_lag(db)
+    lag = settings.MYSQL_REPLICA_MAX_LAG if lag is None else lag
+    as_of = [datetime.now(timezone.utc) - timedelta(seconds=lag)]
+    patients = ready_counts_as_of("patients")
+    if patients is None:
+        patient_rows = query_patient_status_counts(db)
+    else:
+        patient_rows, synced_at = patients
+        as_of.append(synced_at)
+    visits = ready_counts_as_of("visits")
+    if visits is None:
+        visit_counts = query_visit_status_counts(db)
+    else:
+        by_status, synced_at = visits
+        as_of.append(synced_at)
+        visit_counts = {"by_status": by_status, "today": query_today_visits(db)}
+    return patient_rows, visit_counts, min(as_of)
+
+async def dashboard_snapshot() -> Tuple[Dict, datetime]:
+    patient_rows, visit_counts, as_of = await run_in_read_session(query_snapshot_counts)
+    return build_dashboard(patient_rows, visit_counts), as_of
+
+async def performance_snapshot() -> Tuple[Dict, datetime]:
+    patient_rows, visit_counts, as_of = await run_in_read_session(query_snapshot_counts)
+    return build_performance(patient_rows, visit_counts), as_of
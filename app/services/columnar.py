@@ -0,0 +1,240 @@
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dates import facility_time
+from app.db.mysql import run_in_read_session
+
+try:
+    import numpy as np
+except ImportError:  # optional; the engine stays off without it
+    np = None
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("status", "patient_status", "day", "hour", "weekday")
+EPOCH = date(1970, 1, 1)
+NO_SCHEDULE = -(2 ** 63)
+
+
+class DictionaryEncoder:
+    """Maps string values to small int codes, stable across chunks"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def encode(self, values: Iterable[Any]) -> "np.ndarray":
+        codes = []
+        for value in values:
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        return np.array(codes, dtype=np.uint16)
+
+
+@dataclass
+class ColumnarSnapshot:
+    """Column arrays of patients and visits as of ``loaded_at``.
+
+    ``scheduled`` holds scheduled_time as naive seconds since the epoch;
+    rows without one are excluded from time filters and time dimensions.
+    """
+    loaded_at: datetime
+    load_seconds: float
+    patient_count: int
+    visit_status: "np.ndarray"
+    visit_patient_status: "np.ndarray"
+    scheduled: "np.ndarray"
+    has_scheduled: "np.ndarray"
+    status_values: List[Any]
+    patient_status_values: List[Any]
+
+    @property
+    def visit_count(self) -> int:
+        return len(self.visit_status)
+
+
+def _stream(db: Session, statement, chunk_size: int) -> Iterable[Sequence[Tuple]]:
+    result = db.execute(statement, execution_options={"stream_results": True})
+    return result.partitions(chunk_size)
+
+
+def _seconds(moment: datetime) -> int:
+    # Offset-aware request bounds are compared as facility wall-clock time
+    return int((facility_time(moment) - datetime(1970, 1, 1)).total_seconds())
+
+
+def load_snapshot(db: Session, chunk_size: int) -> ColumnarSnapshot:
+    """Read patients and visits in chunks of ``chunk_size`` rows into columns"""
+    started = time.perf_counter()
+    patient_statuses = DictionaryEncoder()
+    patient_ids, patient_codes = [], []
+    for chunk in _stream(db, text("SELECT id, status FROM patients"), chunk_size):
+        patient_ids.append(np.array([row[0] for row in chunk], dtype=np.int64))
+        patient_codes.append(patient_statuses.encode(row[1] for row in chunk))
+    ids = np.concatenate(patient_ids) if patient_ids else np.empty(0, dtype=np.int64)
+    codes = np.concatenate(patient_codes) if patient_codes else np.empty(0, dtype=np.uint16)
+    order = np.argsort(ids)
+    ids, codes = ids[order], codes[order]
+    # Visits whose patient is missing get their own code
+    unknown_patient = len(patient_statuses.values)
+
+    visit_statuses = DictionaryEncoder()
+    statuses, patient_of, scheduled = [], [], []
+    visits = text("SELECT patient_id, status, scheduled_time FROM visits").columns(scheduled_time=DateTime)
+    for chunk in _stream(db, visits, chunk_size):
+        patient_of.append(np.array([row[0] or 0 for row in chunk], dtype=np.int64))
+        statuses.append(visit_statuses.encode(row[1] for row in chunk))
+        scheduled.append(np.array([_seconds(row[2]) if row[2] else NO_SCHEDULE for row in chunk], dtype=np.int64))
+
+    patient_of = np.concatenate(patient_of) if patient_of else np.empty(0, dtype=np.int64)
+    scheduled = np.concatenate(scheduled) if scheduled else np.empty(0, dtype=np.int64)
+    # Join visits to patient status with a binary search over sorted ids
+    visit_patient_status = np.full(len(patient_of), unknown_patient, dtype=np.uint16)
+    if len(ids):
+        position = np.searchsorted(ids, patient_of).clip(0, len(ids) - 1)
+        found = ids[position] == patient_of
+        visit_patient_status[found] = codes[position[found]]
+
+    return ColumnarSnapshot(
+        loaded_at=datetime.now(),
+        load_seconds=time.perf_counter() - started,
+        patient_count=len(ids),
+        visit_status=np.concatenate(statuses) if statuses else np.empty(0, dtype=np.uint16),
+        visit_patient_status=visit_patient_status,
+        scheduled=scheduled,
+        has_scheduled=scheduled != NO_SCHEDULE,
+        status_values=visit_statuses.values,
+        patient_status_values=patient_statuses.values + [None],
+    )
+
+
+def _dimension(snapshot: ColumnarSnapshot, name: str) -> Tuple["np.ndarray", Any]:
+    """Integer key array for ``name`` and a function decoding one key"""
+    if name == "status":
+        return snapshot.visit_status.astype(np.int64), snapshot.status_values.__getitem__
+    if name == "patient_status":
+        return snapshot.visit_patient_status.astype(np.int64), snapshot.patient_status_values.__getitem__
+    if name == "hour":
+        return (snapshot.scheduled // 3600) % 24, int
+    days = snapshot.scheduled // 86400
+    if name == "weekday":
+        # 1970-01-01 was a Thursday; 0 is Monday as in date.weekday()
+        return (days + 3) % 7, int
+    return days, lambda key: (EPOCH + timedelta(days=int(key))).isoformat()
+
+
+def breakdown(snapshot: ColumnarSnapshot, by: Sequence[str], start: Optional[datetime] = None,
+              end: Optional[datetime] = None, status: Optional[str] = None,
+              patient_status: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Visit counts grouped by the ``by`` dimensions, after filtering.
+
+    Keys of all dimensions are packed into one int64 per row so a single
+    np.unique does the grouping.
+    """
+    mask = np.ones(snapshot.visit_count, dtype=bool)
+    if start is not None or end is not None or any(d in ("day", "hour", "weekday") for d in by):
+        mask &= snapshot.has_scheduled
+    if start is not None:
+        mask &= snapshot.scheduled >= _seconds(start)
+    if end is not None:
+        mask &= snapshot.scheduled < _seconds(end)
+    for values, column, wanted in (
+        (snapshot.status_values, snapshot.visit_status, status),
+        (snapshot.patient_status_values, snapshot.visit_patient_status, patient_status),
+    ):
+        if wanted is not None:
+            if wanted in values:
+                mask &= column == values.index(wanted)
+            else:
+                mask[:] = False
+
+    if not by:
+        return [{"count": int(mask.sum())}]
+
+    keys, decoders, offsets, radices = [], [], [], []
+    for name in by:
+        column, decode = _dimension(snapshot, name)
+        column = column[mask]
+        low = int(column.min()) if len(column) else 0
+        keys.append(column - low)
+        offsets.append(low)
+        radices.append(int(column.max()) - low + 1 if len(column) else 1)
+        decoders.append(decode)
+    packed = np.zeros(int(mask.sum()), dtype=np.int64)
+    for column, radix in zip(keys, radices):
+        packed = packed * radix + column
+    groups, counts = np.unique(packed, return_counts=True)
+
+    rows = []
+    for group, count in zip(groups.tolist(), counts.tolist()):
+        row = {}
+        for name, radix, low, decode in reversed(list(zip(by, radices, offsets, decoders))):
+            group, key = divmod(group, radix)
+            row[name] = decode(key + low)
+        rows.append({**{name: row[name] for name in by}, "count": count})
+    return rows
+
+
+async def visit_breakdown(snapshot: ColumnarSnapshot, by: Sequence[str], start: Optional[datetime] = None,
+                          end: Optional[datetime] = None, status: Optional[str] = None,
+                          patient_status: Optional[str] = None) -> List[Dict[str, Any]]:
+    """``breakdown`` on the default thread pool: a full-snapshot scan would
+    otherwise hold the event loop (numpy releases the GIL for most of it)"""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(breakdown, snapshot, by, start, end, status, patient_status))
+
+
+class ColumnarEngine:
+    """Reloads the columnar snapshot on an interval in the background."""
+
+    def __init__(self, interval: float, chunk_size: int):
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.snapshot: Optional[ColumnarSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> ColumnarSnapshot:
+        self.snapshot = await run_in_read_session(load_snapshot, self.chunk_size)
+        return self.snapshot
+
+    def start(self) -> None:
+        if np is None:
+            logger.warning("numpy is not installed; columnar engine disabled")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                snapshot = await self.refresh()
+                logger.info("columnar snapshot loaded: %d visits in %.2fs",
+                            snapshot.visit_count, snapshot.load_seconds)
+            except Exception as e:
+                # Keep serving the previous snapshot
+                logger.warning("columnar snapshot refresh failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+
+columnar_engine = ColumnarEngine(
+    interval=settings.COLUMNAR_REFRESH_INTERVAL,
+    chunk_size=settings.COLUMNAR_CHUNK_SIZE,
+)
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import queries
+from app.db.mysql import run_in_session
+
+logger = logging.getLogger(__name__)
+
+# Rows committed slightly out of updated_at order are caught by re-reading a
+# short window behind the watermark; re-applying a row is a no-op.
+DELTA_LOOKBACK = timedelta(seconds=30)
+SEED_BATCH_SIZE = 10000
+
+_MISSING = object()
+
+
+class StatusCounter:
+    """Materialized row counts per status for one table.
+
+    Keeps the last seen status of every row so updates can move a row from
+    one status bucket to another: memory is O(rows) in every worker process,
+    reads are O(#statuses). Mutations come from worker threads, reads from
+    the event loop.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ready = False
+        self.watermark: Optional[datetime] = None
+        self.seeded_at: Optional[datetime] = None
+        self.reconciled_at: Optional[datetime] = None
+        self.synced_at: Optional[datetime] = None  # UTC moment the counts reflect
+        self.last_drift: Dict[str, int] = {}
+        self._status_by_id: Dict[Any, Any] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def seed(self, rows: Iterable[Tuple[Any, Any]], watermark: Optional[datetime] = None,
+             synced_at: Optional[datetime] = None) -> None:
+        status_by_id = dict(rows)
+        counts = Counter(status_by_id.values())
+        with self._lock:
+            self._status_by_id = status_by_id
+            self._counts = counts
+            self.watermark = watermark
+            self.synced_at = synced_at or datetime.now(timezone.utc)
+            self.seeded_at = datetime.now()
+            self.ready = True
+
+    def apply(self, row_id: Any, status: Any) -> None:
+        with self._lock:
+            previous = self._status_by_id.get(row_id, _MISSING)
+            if previous == status:
+                return
+            if previous is not _MISSING:
+                self._decrement(previous)
+            self._status_by_id[row_id] = status
+            self._counts[status] += 1
+
+    def remove(self, row_id: Any) -> None:
+        with self._lock:
+            previous = self._status_by_id.pop(row_id, _MISSING)
+            if previous is not _MISSING:
+                self._decrement(previous)
+
+    def _decrement(self, status: Any) -> None:
+        self._counts[status] -= 1
+        if self._counts[status] <= 0:
+            del self._counts[status]
+
+    def counts(self) -> List[Dict]:
+        with self._lock:
+            return [{"status": status, "count": count} for status, count in self._counts.items()]
+
+    def counts_as_of(self) -> Tuple[List[Dict], Optional[datetime]]:
+        with self._lock:
+            return [{"status": status, "count": count} for status, count in self._counts.items()], self.synced_at
+
+    def drift(self, actual: List[Dict]) -> Dict[str, int]:
+        """Per-status difference between these counts and ``actual`` (GROUP BY rows).
+
+        Statuses are compared case-insensitively, as MySQL groups them.
+        """
+        expected, found, names = Counter(), Counter(), {}
+        with self._lock:
+            for status, count in self._counts.items():
+                expected[_status_key(status)] += count
+                names.setdefault(_status_key(status), status)
+        for row in actual:
+            found[_status_key(row["status"])] += row["count"]
+            names.setdefault(_status_key(row["status"]), row["status"])
+        diff = {}
+        for key in expected.keys() | found.keys():
+            delta = expected[key] - found[key]
+            if delta:
+                diff[str(names[key])] = delta
+        return diff
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "rows": len(self._status_by_id),
+            "counts": self.counts(),
+            "watermark": self.watermark,
+            "seeded_at": self.seeded_at,
+            "reconciled_at": self.reconciled_at,
+            "synced_at": self.synced_at,
+            "last_drift": self.last_drift,
+        }
+
+
+def _status_key(status: Any) -> Any:
+    return status.casefold() if isinstance(status, str) else status
+
+
+status_counters = {table: StatusCounter(table) for table in queries.COUNTER_TABLES}
+
+
+def ready_counts(name: str) -> Optional[List[Dict]]:
+    """Counts for ``name`` when counters are enabled and seeded, else None"""
+    counter = status_counters[name]
+    if settings.STATUS_COUNTERS_ENABLED and counter.ready:
+        return counter.counts()
+    return None
+
+def ready_counts_as_of(name: str) -> Optional[Tuple[List[Dict], datetime]]:
+    """Like ready_counts, with the moment the counts reflect"""
+    counter = status_counters[name]
+    if settings.STATUS_COUNTERS_ENABLED and counter.ready:
+        return counter.counts_as_of()
+    return None
+
+# MySQL tables: seeded by a streaming scan, kept current by a delta scan on
+# the updated_at watermark (served by ix_<table>_updated_at)
+
+def seed_table_counter(db: Session, counter: StatusCounter, table: str) -> None:
+    started = datetime.now(timezone.utc)
+    result = db.execute(
+        queries.STATUS_ROWS[table],
+        execution_options={"stream_results": True},
+    )
+    watermark = None
+    rows = []
+    for batch in result.partitions(SEED_BATCH_SIZE):
+        for row_id, status, updated_at in batch:
+            rows.append((row_id, status))
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+    counter.seed(rows, watermark, started)
+
+
+def delta_scan_table(db: Session, counter: StatusCounter, table: str) -> int:
+    """Apply rows changed since the watermark; returns the number read"""
+    if counter.watermark is None:
+        seed_table_counter(db, counter, table)
+        return 0
+    started = datetime.now(timezone.utc)
+    result = db.execute(queries.STATUS_ROWS_SINCE[table], {"since": counter.watermark - DELTA_LOOKBACK})
+    watermark = counter.watermark
+    seen = 0
+    for row_id, status, updated_at in result:
+        counter.apply(row_id, status)
+        if updated_at is not None and updated_at > watermark:
+            watermark = updated_at
+        seen += 1
+    counter.watermark = watermark
+    counter.synced_at = started
+    return seen
+
+
+def _snapshot_drift(db: Session, counter: StatusCounter, table: str) -> Dict[str, int]:
+    """Delta scan, then GROUP BY, in one REPEATABLE READ snapshot on MySQL, so
+    writes committed in between can't show up as drift"""
+    if db.get_bind().dialect.name == "mysql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    delta_scan_table(db, counter, table)
+    actual = db.execute(queries.STATUS_COUNTS[table])
+    return counter.drift([{"status": r[0], "count": int(r[1])} for r in actual])
+
+
+def reconcile_table_counter(db: Session, counter: StatusCounter, table: str) -> Dict[str, int]:
+    """Compare against a full GROUP BY and reseed on drift.
+
+    Deletes never advance updated_at, so they only surface here: a deleted
+    row stays counted for up to STATUS_COUNTERS_RECONCILE_INTERVAL seconds.
+    Drift is confirmed in a second snapshot before the reseed, a full scan.
+    """
+    drift = _snapshot_drift(db, counter, table)
+    if drift:
+        db.commit()
+        drift = _snapshot_drift(db, counter, table)
+    counter.last_drift = drift
+    counter.reconciled_at = datetime.now()
+    if drift:
+        logger.warning("%s status counters drifted %s; reseeding", table, drift)
+        seed_table_counter(db, counter, table)
+    return drift
+
+class CounterMaintainer:
+    """Background task that seeds, updates and reconciles the status counters."""
+
+    TABLES = queries.COUNTER_TABLES
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self._maintain_tables()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _maintain_tables(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_reconcile = loop.time() + settings.STATUS_COUNTERS_RECONCILE_INTERVAL
+        while True:
+            reconcile = loop.time() >= next_reconcile
+            for table in self.TABLES:
+                counter = status_counters[table]
+                try:
+                    if not counter.ready:
+                        await run_in_session(seed_table_counter, counter, table)
+                        logger.info("%s status counters seeded", table)
+                    elif reconcile:
+                        await run_in_session(reconcile_table_counter, counter, table)
+                    else:
+                        await run_in_session(delta_scan_table, counter, table)
+                except Exception as e:
+                    logger.warning("%s status counter refresh failed: %s", table, e)
+            if reconcile:
+                next_reconcile = loop.time() + settings.STATUS_COUNTERS_RECONCILE_INTERVAL
+            await asyncio.sleep(settings.STATUS_COUNTERS_DELTA_INTERVAL)
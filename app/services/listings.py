@@ -0,0 +1,159 @@
+import base64
+import binascii
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import DateTime, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dates import facility_time
+from app.core.serialization import dumps
+from app.db.mysql import read_session, stream_in_session
+
+# Listings seek past the last row of the previous page instead of using
+# OFFSET, so page N costs the same as page 1. The sort keys double as the
+# cursor: (scheduled_time, id) for visits, served by ix_visits_scheduled_time
+# (InnoDB secondary indexes end with the primary key), and id for patients.
+
+
+def encode_cursor(key: List[Any]) -> str:
+    """Opaque token for the sort key of the last row on a page"""
+    return base64.urlsafe_b64encode(dumps(key)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        key = None
+    if not isinstance(key, list) or len(key) != size:
+        raise ValueError("invalid cursor")
+    return key
+
+
+def _cursor_id(value: Any) -> int:
+    # bool is an int subclass, but no row has id true
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("invalid cursor")
+    return value
+
+
+def _range_params(predicates: List[str], params: Dict[str, Any], column: str,
+                  start: Optional[datetime], end: Optional[datetime]) -> None:
+    # The driver drops tzinfo, so offset-aware bounds go in as facility time
+    if start:
+        predicates.append(f"{column} >= :start")
+        params["start"] = facility_time(start)
+    if end:
+        predicates.append(f"{column} < :end")
+        params["end"] = facility_time(end)
+
+
+def visit_page_query(status: Optional[str] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, cursor: Optional[str] = None,
+                     limit: int = 100) -> Tuple[Any, Dict[str, Any]]:
+    """Statement and params for one page of visits in (scheduled_time, id) order.
+
+    Visits without a scheduled_time have no place in that order and are
+    left out. One row past ``limit`` is selected to tell whether another
+    page follows.
+    """
+    predicates = ["scheduled_time IS NOT NULL"]
+    params: Dict[str, Any] = {"limit": limit + 1}
+    if status:
+        predicates.append("status = :status")
+        params["status"] = status
+    _range_params(predicates, params, "scheduled_time", start, end)
+    if cursor:
+        after_time, after_id = decode_cursor(cursor, 2)
+        try:
+            params["after_time"] = facility_time(datetime.fromisoformat(after_time))
+        except (TypeError, ValueError):
+            raise ValueError("invalid cursor")
+        params["after_id"] = _cursor_id(after_id)
+        # The leading >= gives the optimizer a plain range on the index
+        predicates.append(
+            "scheduled_time >= :after_time"
+            " AND (scheduled_time > :after_time OR (scheduled_time = :after_time AND id > :after_id))"
+        )
+    statement = text(f"""
+        SELECT id, patient_id, status, scheduled_time
+        FROM visits
+        WHERE {" AND ".join(predicates)}
+        ORDER BY scheduled_time, id
+        LIMIT :limit
+    """).columns(scheduled_time=DateTime)
+    return statement, params
+
+
+def patient_page_query(status: Optional[str] = None, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None, cursor: Optional[str] = None,
+                       limit: int = 100) -> Tuple[Any, Dict[str, Any]]:
+    """Statement and params for one page of patients in id order.
+
+    from/to filter on updated_at; paging follows the primary key rather
+    than updated_at, which changes under the reader.
+    """
+    predicates = []
+    params: Dict[str, Any] = {"limit": limit + 1}
+    if status:
+        predicates.append("status = :status")
+        params["status"] = status
+    _range_params(predicates, params, "updated_at", start, end)
+    if cursor:
+        (after_id,) = decode_cursor(cursor, 1)
+        params["after_id"] = _cursor_id(after_id)
+        predicates.append("id > :after_id")
+    where = f"WHERE {' AND '.join(predicates)}" if predicates else ""
+    statement = text(f"""
+        SELECT id, name, status, updated_at
+        FROM patients
+        {where}
+        ORDER BY id
+        LIMIT :limit
+    """).columns(updated_at=DateTime)
+    return statement, params
+
+
+def visit_key(row) -> List[Any]:
+    return [row.scheduled_time.isoformat(), row.id]
+
+
+def patient_key(row) -> List[Any]:
+    return [row.id]
+
+
+async def stream_page(statement, params: Dict[str, Any], limit: int, key: Callable[[Any], List[Any]],
+                      session_factory: Callable[[], Session] = read_session) -> AsyncIterator[bytes]:
+    """Yield one page as ``{"data": [...], "next_cursor": ...}``.
+
+    Rows are written as they arrive from the server-side cursor, so memory
+    stays flat whatever the page size. next_cursor is null on the last page.
+    """
+    yield b'{"data":['
+    sent, last, more, error = 0, None, False, None
+    try:
+        chunks = stream_in_session(statement, params, settings.LISTING_FETCH_SIZE, session_factory)
+        async with aclosing(chunks):
+            async for rows in chunks:
+                if sent + len(rows) > limit:
+                    rows, more = rows[:limit - sent], True
+                if rows:
+                    body = b",".join(dumps(dict(row._mapping)) for row in rows)
+                    yield (b"," if sent else b"") + body
+                    sent += len(rows)
+                    last = rows[-1]
+                if more:
+                    break
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        error = str(e)
+        more = False
+    next_cursor = encode_cursor(key(last)) if more else None
+    tail = b'],"next_cursor":' + dumps(next_cursor)
+    if error is not None:
+        tail += b',"error":' + dumps(error)
+    yield tail + b"}"
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.dates import DayWindow, day_windows
+from app.core.serialization import dumps
+from app.services import aggregates
+from app.services.visits import visits_query
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, int, Dict[str, Any]]
+
+
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON Merge Patch (RFC 7396) turning ``old`` into ``new``.
+
+    Nested objects are diffed key by key; lists are replaced whole and
+    removed keys are set to null. Empty when nothing changed.
+    """
+    patch: Dict[str, Any] = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = merge_patch(previous, value)
+            if nested:
+                patch[key] = nested
+        elif key not in old or previous != value:
+            patch[key] = value
+    return patch
+
+
+def format_event(event: Event) -> bytes:
+    name, version, data = event
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (name.encode(), version, dumps(data))
+
+
+async def visit_data_today(mongo_db, window: Optional[DayWindow] = None) -> List[Dict]:
+    """visit_data counts per status for the facility day ``window`` (default today),
+    the same day the MySQL figures count"""
+    window = window or day_windows.today()
+    cursor = mongo_db.visit_data.aggregate([
+        {"$match": visits_query(window.utc_start, window.utc_end)},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ])
+    rows = [{"status": doc["_id"], "count": doc["count"]} async for doc in cursor]
+    # Stable order, so an unchanged result never shows up as a patch
+    return sorted(rows, key=lambda r: str(r["status"]))
+
+
+async def live_state(mongo_db=None) -> Dict[str, Any]:
+    """Everything a nurse-station screen shows, computed once per tick"""
+    if mongo_db is None:
+        return await aggregates.dashboard_payload()
+    dashboard, today = await asyncio.gather(
+        aggregates.dashboard_payload(), visit_data_today(mongo_db), return_exceptions=True)
+    if isinstance(dashboard, BaseException):
+        raise dashboard
+    if isinstance(today, BaseException):
+        # MySQL figures still go out; the key is nulled until MongoDB answers
+        logger.warning("visit_data live counts failed: %s", today)
+        return dashboard
+    return {**dashboard, "visit_data_today": today}
+
+
+class LiveBroadcaster:
+    """Computes the live state in one background task and fans changes out.
+
+    Each subscriber gets the current state as a ``snapshot`` event, then a
+    ``patch`` event (JSON Merge Patch) whenever a tick changes it, so the
+    database sees one query set per tick however many screens are open.
+    Ticks run every ``interval`` seconds while anyone is subscribed, or
+    sooner when ``poke`` is called (visit_data change stream), but never
+    closer together than ``min_interval``.
+    """
+
+    def __init__(self, producer: Callable[[Any], Awaitable[Dict[str, Any]]], interval: float,
+                 min_interval: float, queue_size: int):
+        self.producer = producer
+        self.interval = interval
+        self.min_interval = min_interval
+        self.queue_size = queue_size
+        self.state: Dict[str, Any] = {}
+        self.version = 0
+        self.mongo_db = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.version:
+            queue.put_nowait(("snapshot", self.version, self.state))
+        self._subscribers.add(queue)
+        self.poke()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def poke(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _publish(self, event: Event) -> None:
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client too slow to keep up skips the backlog and resyncs
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", self.version, self.state))
+
+    async def tick(self) -> Optional[Dict[str, Any]]:
+        """Recompute the state; publish and return the patch if it changed"""
+        state = await self.producer(self.mongo_db)
+        patch = merge_patch(self.state, state)
+        if not patch:
+            return None
+        self.state = state
+        self.version += 1
+        self._publish(("patch", self.version, patch))
+        return patch
+
+    async def events(self, heartbeat: float) -> AsyncIterator[bytes]:
+        """Server-Sent Events for one client, with a comment every ``heartbeat`` seconds"""
+        queue = self.subscribe()
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield b": keepalive\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            self.unsubscribe(queue)
+
+    def start(self, mongo_db=None, watch: bool = False) -> None:
+        if self._tasks:
+            return
+        self.mongo_db = mongo_db
+        # Created here so it belongs to the running loop
+        self._wake = asyncio.Event()
+        self._tasks.append(asyncio.create_task(self._run()))
+        if watch and mongo_db is not None:
+            self._tasks.append(asyncio.create_task(self._watch(mongo_db.visit_data)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self) -> None:
+        while True:
+            # Cleared before the tick so a poke arriving during it is kept
+            self._wake.clear()
+            timeout = None  # idle with no subscribers until subscribe() pokes
+            if self._subscribers:
+                try:
+                    await self.tick()
+                except Exception as e:
+                    # Clients keep the last state until a tick succeeds
+                    logger.warning("live state refresh failed: %s", e)
+                await asyncio.sleep(self.min_interval)
+                timeout = max(self.interval - self.min_interval, 0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _watch(self, collection) -> None:
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        try:
+            async with collection.watch(pipeline) as stream:
+                async for _ in stream:
+                    self.poke()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Standalone servers have no change streams; ticks still run on the interval
+            logger.warning("visit_data change stream unavailable (%s); live updates use the interval only", e)
+
+
+live_updates = LiveBroadcaster(
+    live_state,
+    interval=settings.LIVE_INTERVAL,
+    min_interval=settings.LIVE_MIN_INTERVAL,
+    queue_size=settings.LIVE_QUEUE_SIZE,
+)
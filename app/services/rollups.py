@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import time
+import weakref
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Date, DateTime, Integer, MetaData, String, Table, bindparam, delete, func, inspect, select, text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.dates import day_bounds, facility_now, facility_today, utc_day_bounds
+from app.db.mysql import engine, run_in_read_session
+from app.services.staff_tasks import daily_task_summary_pipeline, task_summary
+from app.services.timeseries import bucket_expression
+
+logger = logging.getLogger(__name__)
+
+# Daily aggregates written by scripts/rollup.py. Each run deletes and
+# rewrites whole days, so re-running a day replaces its rows.
+rollup_metadata = MetaData()
+
+visit_daily_rollup = Table(
+    "visit_daily_rollup", rollup_metadata,
+    Column("day", Date, primary_key=True),
+    Column("status", String(32), primary_key=True),
+    Column("visit_count", Integer, nullable=False),
+    Column("rolled_up_at", DateTime, nullable=False),
+)
+
+staff_task_daily_rollup = Table(
+    "staff_task_daily_rollup", rollup_metadata,
+    Column("day", Date, primary_key=True),
+    Column("staff_id", String(64), primary_key=True),
+    Column("total_visits", Integer, nullable=False),
+    Column("total_tasks", Integer, nullable=False),
+    Column("completed_tasks", Integer, nullable=False),
+    Column("high_priority_pending", Integer, nullable=False),
+    Column("rolled_up_at", DateTime, nullable=False),
+)
+
+# One row per (rollup table, day) the job has written, so readers can tell a
+# day with no visits from a day that was never rolled up
+rollup_days = Table(
+    "rollup_days", rollup_metadata,
+    Column("rollup", String(64), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("rolled_up_at", DateTime, nullable=False),
+)
+
+# Task counters as named in the aggregation output, by rollup column
+STAFF_TASK_COLUMNS = {
+    "total_visits": "totalVisits",
+    "total_tasks": "totalTasks",
+    "completed_tasks": "completedTasks",
+    "high_priority_pending": "highPriorityPending",
+}
+
+
+def ensure_rollup_tables(bind) -> None:
+    rollup_metadata.create_all(bind, checkfirst=True)
+
+
+async def prepare_rollup_tables() -> None:
+    """Create the rollup tables at startup (ROLLUP_CREATE_TABLES); needs CREATE rights"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, ensure_rollup_tables, engine)
+    except Exception as e:
+        logger.warning("rollup tables unavailable: %s", e)
+
+
+def iter_days(start_day: date, end_day: date) -> Iterable[date]:
+    day = start_day
+    while day < end_day:
+        yield day
+        day += timedelta(days=1)
+
+# Whether the rollup tables exist, by engine. Missing tables are looked for
+# again every TABLE_RECHECK_INTERVAL seconds, so a first job run is picked up
+# without failing a query on every request until then.
+TABLE_RECHECK_INTERVAL = 300.0
+_tables_present: "weakref.WeakKeyDictionary[Any, Tuple[bool, float]]" = weakref.WeakKeyDictionary()
+
+
+def _rollup_tables_present(db: Session) -> bool:
+    bind = db.get_bind()
+    present, checked_at = _tables_present.get(bind, (False, None))
+    if present or (checked_at is not None and time.monotonic() - checked_at < TABLE_RECHECK_INTERVAL):
+        return present
+    inspector = inspect(db.connection())
+    present = all(inspector.has_table(table.name) for table in rollup_metadata.sorted_tables)
+    if not present and checked_at is None:
+        logger.info("rollup tables missing, daily endpoints read raw data")
+    _tables_present[bind] = (present, time.monotonic())
+    return present
+
+
+def _rollup_tables_lost(db: Session, error: Exception) -> None:
+    logger.warning("rollup tables unreadable, reading raw data: %s", error.__class__.__name__)
+    _tables_present[db.get_bind()] = (False, time.monotonic())
+
+# Writers, one day per call and transaction
+
+def _mark_rolled_up(db: Session, table: Table, day: date, now: datetime) -> None:
+    db.execute(delete(rollup_days).where(rollup_days.c.rollup == table.name, rollup_days.c.day == day))
+    db.execute(rollup_days.insert(), {"rollup": table.name, "day": day, "rolled_up_at": now})
+
+
+def rollup_visit_day(db: Session, day: date) -> int:
+    """Rewrite ``day``'s per-status visit counts; returns the visits counted"""
+    day_start, day_end = day_bounds(day)
+    now = facility_now()
+    db.execute(delete(visit_daily_rollup).where(visit_daily_rollup.c.day == day))
+    db.execute(text("""
+        INSERT INTO visit_daily_rollup (day, status, visit_count, rolled_up_at)
+        SELECT :day, COALESCE(status, ''), COUNT(*), :now
+        FROM visits
+        WHERE scheduled_time >= :day_start AND scheduled_time < :day_end
+        GROUP BY COALESCE(status, '')
+    """).bindparams(bindparam("day", type_=Date), bindparam("now", type_=DateTime)),
+        {"day": day, "now": now, "day_start": day_start, "day_end": day_end})
+    total = db.execute(
+        select(func.coalesce(func.sum(visit_daily_rollup.c.visit_count), 0))
+        .where(visit_daily_rollup.c.day == day)
+    ).scalar()
+    _mark_rolled_up(db, visit_daily_rollup, day, now)
+    db.commit()
+    return int(total)
+
+
+def rollup_staff_task_day(db: Session, day: date, summaries: Iterable[Dict[str, Any]]) -> int:
+    """Rewrite ``day``'s per-staff task counters from all_staff_task_summary_pipeline
+    output; returns the staff rows written"""
+    now = facility_now()
+    rows = [
+        {"day": day, "staff_id": str(summary["_id"]), "rolled_up_at": now,
+         **{column: int(summary.get(field, 0)) for column, field in STAFF_TASK_COLUMNS.items()}}
+        for summary in summaries if summary.get("_id") is not None
+    ]
+    db.execute(delete(staff_task_daily_rollup).where(staff_task_daily_rollup.c.day == day))
+    if rows:
+        db.execute(staff_task_daily_rollup.insert(), rows)
+    _mark_rolled_up(db, staff_task_daily_rollup, day, now)
+    db.commit()
+    return len(rows)
+
+# Readers: the leading run of rolled-up days comes from the rollup tables,
+# everything from the first day missing (a gap, today, or anything the job
+# has not reached yet) from the raw data
+
+def _tail_start(db: Session, table: Table, start_day: date, end_day: date) -> date:
+    """First day of [start_day, end_day) not covered by ``table``.
+
+    Rollups of today or later would be partial, so they never count. With
+    the rollup tables missing or unreadable every day is left to the raw tail.
+    """
+    last = min(end_day, facility_today())
+    if not _rollup_tables_present(db):
+        return start_day
+    try:
+        covered = set(db.execute(
+            select(rollup_days.c.day)
+            .where(rollup_days.c.rollup == table.name, rollup_days.c.day >= start_day, rollup_days.c.day < last)
+        ).scalars())
+    except DBAPIError as e:
+        db.rollback()
+        _rollup_tables_lost(db, e)
+        return start_day
+    for day in iter_days(start_day, last):
+        if day not in covered:
+            return day
+    return max(start_day, last)
+
+
+def query_visit_daily(db: Session, start_day: date, end_day: date,
+                      status: Optional[str] = None) -> List[Dict]:
+    """Per-day, per-status visit counts for [start_day, end_day)"""
+    tail_start = _tail_start(db, visit_daily_rollup, start_day, end_day)
+    rows = []
+    if start_day < tail_start:
+        rollup = select(visit_daily_rollup.c.day, visit_daily_rollup.c.status, visit_daily_rollup.c.visit_count) \
+            .where(visit_daily_rollup.c.day >= start_day, visit_daily_rollup.c.day < tail_start)
+        if status is not None:
+            rollup = rollup.where(visit_daily_rollup.c.status == status)
+        rows = [(day, row_status, count) for day, row_status, count in db.execute(rollup)]
+
+    if tail_start < end_day:
+        day_expr = bucket_expression(db.get_bind(), "day")
+        status_predicate = "AND status = :status" if status is not None else ""
+        raw = db.execute(text(f"""
+            SELECT {day_expr} AS day, COALESCE(status, '') AS status, COUNT(*) AS count
+            FROM visits
+            WHERE scheduled_time >= :start AND scheduled_time < :end {status_predicate}
+            GROUP BY day, COALESCE(status, '')
+        """), {"start": day_bounds(tail_start)[0], "end": day_bounds(end_day)[0], "status": status})
+        rows.extend((_as_date(day), row_status, count) for day, row_status, count in raw)
+
+    return [
+        {"day": day.isoformat(), "status": row_status, "count": int(count)}
+        for day, row_status, count in sorted(rows)
+    ]
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def query_staff_task_rollup(db: Session, staff_id: str, start_day: date,
+                            end_day: date) -> Tuple[List[Dict], date]:
+    """Rolled-up task counters for one staff member, and the first day left
+    for the raw tail"""
+    tail_start = _tail_start(db, staff_task_daily_rollup, start_day, end_day)
+    if tail_start <= start_day:
+        return [], start_day
+    result = db.execute(
+        select(staff_task_daily_rollup)
+        .where(staff_task_daily_rollup.c.staff_id == staff_id,
+               staff_task_daily_rollup.c.day >= start_day,
+               staff_task_daily_rollup.c.day < tail_start)
+        .order_by(staff_task_daily_rollup.c.day)
+    ).mappings()
+    rows = []
+    for row in result:
+        counts = {field: row[column] for column, field in STAFF_TASK_COLUMNS.items()}
+        counts["pendingTasks"] = row["total_tasks"] - row["completed_tasks"]
+        rows.append({"day": row["day"].isoformat(), **task_summary(counts)})
+    return rows, tail_start
+
+
+async def staff_task_daily(mongo_db, staff_id: str, start_day: date, end_day: date) -> List[Dict]:
+    """Per-day task summaries for one staff member over [start_day, end_day).
+
+    Days with no visits are omitted.
+    """
+    rows, tail_start = await run_in_read_session(query_staff_task_rollup, staff_id, start_day, end_day)
+    if tail_start < end_day:
+        pipeline = daily_task_summary_pipeline(staff_id, utc_day_bounds(tail_start)[0], utc_day_bounds(end_day)[0])
+        tail = await mongo_db.visit_data.aggregate(pipeline).to_list(length=None)
+        rows.extend({"day": doc["_id"], **task_summary(doc)} for doc in sorted(tail, key=lambda d: d["_id"]))
+    return rows
+
+
+async def visit_daily(start_day: date, end_day: date, status: Optional[str] = None) -> List[Dict]:
+    return await run_in_read_session(query_visit_daily, start_day, end_day, status)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+from app.core.http_cache import etag_for
+from app.core.serialization import dumps
+from app.services import aggregates
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    body: bytes
+    etag: str  # weak, over the data only, so an unchanged payload keeps its tag
+    generated_at: datetime  # when the data was read, not serialized
+    computed_at: float  # monotonic, for staleness checks
+
+    def age(self) -> float:
+        return time.monotonic() - self.computed_at
+
+    def response(self) -> Response:
+        return Response(content=self.body, media_type="application/json")
+
+
+def render_data(data: Any) -> bytes:
+    return dumps(data)
+
+
+def render_payload(data: bytes, generated_at: datetime) -> bytes:
+    return b'{"data":%s,"generated_at":"%s"}' % (data, generated_at.isoformat().encode())
+
+
+class SnapshotScheduler:
+    """Recomputes global payloads on an interval and keeps them serialized.
+
+    Requests are answered from the stored bytes while the snapshot is no
+    older than ``max_age``; otherwise the caller computes live through
+    ``refresh``, which also replaces the stored snapshot. With
+    SNAPSHOT_ENABLED off nothing is stored and every request is live.
+    Producers return the payload and the moment its data reflects.
+    """
+
+    def __init__(self, interval: float, max_age: float):
+        self.interval = interval
+        self.max_age = max_age
+        self._producers: Dict[str, Callable[[], Awaitable[Tuple[Any, datetime]]]] = {}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, producer: Callable[[], Awaitable[Tuple[Any, datetime]]]) -> None:
+        self._producers[name] = producer
+
+    def fresh(self, name: str) -> Optional[Snapshot]:
+        if not settings.SNAPSHOT_ENABLED:
+            return None
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and snapshot.age() <= self.max_age:
+            return snapshot
+        return None
+
+    async def refresh(self, name: str) -> Snapshot:
+        payload, generated_at = await self._producers[name]()
+        data = render_data(payload)
+        snapshot = Snapshot(
+            body=render_payload(data, generated_at),
+            etag=etag_for(data, weak=True),
+            generated_at=generated_at,
+            computed_at=time.monotonic(),
+        )
+        if settings.SNAPSHOT_ENABLED:
+            self._snapshots[name] = snapshot
+        return snapshot
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            for name in self._producers:
+                try:
+                    await self.refresh(name)
+                except Exception as e:
+                    # Keep serving the previous snapshot until it goes stale
+                    logger.warning("%s snapshot refresh failed: %s", name, e)
+            await asyncio.sleep(self.interval)
+
+
+payload_snapshots = SnapshotScheduler(
+    interval=settings.SNAPSHOT_INTERVAL,
+    max_age=settings.SNAPSHOT_MAX_AGE,
+)
+payload_snapshots.register("dashboard", aggregates.dashboard_snapshot)
+payload_snapshots.register("performance", aggregates.performance_snapshot)
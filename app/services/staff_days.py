@@ -0,0 +1,118 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReplaceOne
+
+from app.core.config import settings
+from app.core.dates import facility_today, utc_day_bounds
+from app.services.rollups import iter_days
+from app.services.staff_tasks import daily_task_summary_pipeline, task_summary, task_summary_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Counters summed across days; pendingTasks and completionRate are derived
+DAY_COUNTERS = ("totalVisits", "totalTasks", "completedTasks", "highPriorityPending")
+
+
+class StaffDayCache:
+    """Per-staff, per-day task counters of settled days in a MongoDB collection.
+
+    Days past the settle window no longer change, so each is aggregated from
+    visit_data once and read back from here afterwards; days without visits are stored as
+    zeros so they are not recomputed either. ``_id`` is ``staffId:YYYY-MM-DD``,
+    which keeps one staff member's days contiguous in the _id index.
+    """
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+
+    @staticmethod
+    def key(staff_id: str, day: date) -> str:
+        return f"{staff_id}:{day.isoformat()}"
+
+    async def load(self, mongo_db, staff_id: str, start_day: date, end_day: date) -> Dict[date, Dict]:
+        query = {
+            "_id": {"$gte": self.key(staff_id, start_day), "$lt": self.key(staff_id, end_day)},
+            "staffId": staff_id,
+        }
+        cursor = mongo_db[self.collection_name].find(query)
+        return {date.fromisoformat(doc["day"]): doc async for doc in cursor}
+
+    async def store(self, mongo_db, staff_id: str, days: Dict[date, Dict]) -> None:
+        now = datetime.now()
+        await mongo_db[self.collection_name].bulk_write([
+            ReplaceOne(
+                {"_id": self.key(staff_id, day)},
+                {"staffId": staff_id, "day": day.isoformat(), "computedAt": now,
+                 **{field: int(counts.get(field, 0)) for field in DAY_COUNTERS}},
+                upsert=True,
+            )
+            for day, counts in days.items()
+        ], ordered=False)
+
+
+def sum_counters(days: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    totals = dict.fromkeys(DAY_COUNTERS, 0)
+    for counts in days:
+        for field in DAY_COUNTERS:
+            totals[field] += int(counts.get(field, 0))
+    totals["pendingTasks"] = totals["totalTasks"] - totals["completedTasks"]
+    return totals
+
+
+async def compute_days(mongo_db, staff_id: str, days: List[date]) -> Dict[date, Dict]:
+    """Counters for ``days`` from one aggregation over their span"""
+    start, end = utc_day_bounds(min(days))[0], utc_day_bounds(max(days))[1]
+    pipeline = daily_task_summary_pipeline(staff_id, start, end)
+    by_day = {doc["_id"]: doc async for doc in mongo_db.visit_data.aggregate(pipeline)}
+    return {day: by_day.get(day.isoformat(), {}) for day in days}
+
+
+async def staff_task_range(mongo_db, staff_id: str, start_day: date, end_day: date,
+                           cache: Optional[StaffDayCache] = None, today: Optional[date] = None,
+                           settle_days: Optional[int] = None) -> Dict[str, Any]:
+    """Task summary for one staff member over [start_day, end_day).
+
+    Days older than ``settle_days`` come from the day cache; the missing ones
+    and the unsettled recent days are filled by a single aggregation, and
+    only the settled ones are stored. Today is aggregated live. Days after
+    today have no data.
+    """
+    cache = cache or staff_day_cache
+    today = today or facility_today()
+    settle_days = settings.STAFF_DAY_CACHE_SETTLE_DAYS if settle_days is None else settle_days
+    if start_day > end_day:
+        raise ValueError("from must not be after to")
+    if (end_day - start_day).days > settings.STAFF_TASKS_MAX_DAYS:
+        raise ValueError(f"range spans more than STAFF_TASKS_MAX_DAYS={settings.STAFF_TASKS_MAX_DAYS} days")
+
+    days: List[Dict] = []
+    past_end = min(end_day, today)
+    settled_end = min(past_end, today - timedelta(days=settle_days))
+    cached: Dict[date, Dict] = {}
+    if start_day < settled_end:
+        cached = await cache.load(mongo_db, staff_id, start_day, settled_end)
+        days.extend(cached.values())
+    pending = [day for day in iter_days(start_day, past_end) if day not in cached]
+    if pending:
+        computed = await compute_days(mongo_db, staff_id, pending)
+        settled = {day: counts for day, counts in computed.items() if day < settled_end}
+        if settled:
+            try:
+                await cache.store(mongo_db, staff_id, settled)
+            except Exception as e:
+                # The summary is still right; the days are recomputed next time
+                logger.warning("staff day cache write failed: %s", e)
+        days.extend(computed.values())
+
+    if start_day <= today < end_day:
+        today_start, today_end = utc_day_bounds(today)
+        result = await mongo_db.visit_data.aggregate(
+            task_summary_pipeline(staff_id, today_start, today_end)).to_list(length=1)
+        days.extend(result)
+
+    return {"from": start_day.isoformat(), "to": end_day.isoformat(), **task_summary(sum_counters(days))}
+
+
+staff_day_cache = StaffDayCache(settings.STAFF_DAY_CACHE_COLLECTION)
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.visit_fields import VisitFields, visit_fields
+
+TASK_SUMMARY_FIELDS = ("totalTasks", "completedTasks", "pendingTasks", "highPriorityPending", "totalVisits")
+
+
+def _task_summary_stages(match: Dict[str, Any], group_id: Any, fields: VisitFields,
+                         keys: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    tasks = {"$ifNull": [f"${fields.tasks}", []]}
+    done = {"$eq": [f"$$t.{fields.task_done}", fields.task_done_value]}
+    not_done = {"$ne": [f"$$t.{fields.task_done}", fields.task_done_value]}
+
+    def tasks_where(cond: Dict[str, Any]) -> Dict[str, Any]:
+        # Number of entries in the visit's tasks array matching ``cond``
+        return {"$size": {"$filter": {"input": tasks, "as": "t", "cond": cond}}}
+
+    return [
+        {"$match": match},
+        {"$project": {
+            "_id": 0,
+            "staffId": f"${fields.staff}",
+            **(keys or {}),
+            "totalTasks": {"$size": tasks},
+            "completedTasks": tasks_where(done),
+            "highPriorityPending": tasks_where({"$and": [
+                not_done,
+                {"$eq": [f"$$t.{fields.task_priority}", "high"]},
+            ]}),
+        }},
+        {"$group": {
+            "_id": group_id,
+            "totalTasks": {"$sum": "$totalTasks"},
+            "completedTasks": {"$sum": "$completedTasks"},
+            "highPriorityPending": {"$sum": "$highPriorityPending"},
+            "totalVisits": {"$sum": 1},
+        }},
+        {"$project": {
+            "totalTasks": 1,
+            "completedTasks": 1,
+            "pendingTasks": {"$subtract": ["$totalTasks", "$completedTasks"]},
+            "highPriorityPending": 1,
+            "totalVisits": 1,
+        }},
+    ]
+
+
+def task_summary_pipeline(staff_id: str, start: datetime, end: datetime,
+                          fields: VisitFields = visit_fields) -> List[Dict[str, Any]]:
+    """Aggregation that reduces a staff member's visits to task counters.
+
+    Counting happens per visit on the server, so only one small document
+    comes back instead of every visit with its full ``tasks`` array.
+    """
+    match = {fields.staff: staff_id, "scheduledTime": {"$gte": start, "$lt": end}}
+    return _task_summary_stages(match, group_id=None, fields=fields)
+
+
+def batch_task_summary_pipeline(staff_ids: List[str], start: datetime, end: datetime,
+                                fields: VisitFields = visit_fields) -> List[Dict[str, Any]]:
+    """Like task_summary_pipeline, but one counters document per staff id (as ``_id``)."""
+    match = {fields.staff: {"$in": staff_ids}, "scheduledTime": {"$gte": start, "$lt": end}}
+    return _task_summary_stages(match, group_id="$staffId", fields=fields)
+
+
+def all_staff_task_summary_pipeline(start: datetime, end: datetime,
+                                    fields: VisitFields = visit_fields) -> List[Dict[str, Any]]:
+    """One counters document per staff member with visits in [start, end)"""
+    match = {"scheduledTime": {"$gte": start, "$lt": end}}
+    return _task_summary_stages(match, group_id="$staffId", fields=fields)
+
+
+def daily_task_summary_pipeline(staff_id: str, start: datetime, end: datetime,
+                                fields: VisitFields = visit_fields) -> List[Dict[str, Any]]:
+    """Like task_summary_pipeline, but one counters document per day (``_id`` as YYYY-MM-DD)."""
+    match = {fields.staff: staff_id, "scheduledTime": {"$gte": start, "$lt": end}}
+    day = {"$dateToString": {"format": "%Y-%m-%d", "date": "$scheduledTime"}}
+    if settings.FACILITY_TIMEZONE != "UTC":
+        # Days follow the facility's calendar; UTC is the server default
+        day["$dateToString"]["timezone"] = settings.FACILITY_TIMEZONE
+    return _task_summary_stages(match, group_id="$day", fields=fields, keys={"day": day})
+
+
+def task_summary(counts: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Shape aggregation output into the endpoint payload"""
+    counts = counts or {}
+    data = {field: int(counts.get(field, 0)) for field in TASK_SUMMARY_FIELDS}
+    # Calculate completion rate
+    total_tasks = data["totalTasks"]
+    completion_rate = (data["completedTasks"] / total_tasks * 100) if total_tasks > 0 else 0
+    data["completionRate"] = round(completion_rate, 1)
+    return data
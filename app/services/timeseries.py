@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dates import facility_now
+from app.db.mysql import run_in_read_session, session_lag
+
+# Bucket start for scheduled_time, per dialect. Weeks start on Monday.
+BUCKET_SQL = {
+    "mysql": {
+        "hour": "DATE_FORMAT(scheduled_time, '%Y-%m-%d %H:00:00')",
+        "day": "DATE(scheduled_time)",
+        "week": "DATE_SUB(DATE(scheduled_time), INTERVAL WEEKDAY(scheduled_time) DAY)",
+    },
+    "sqlite": {
+        "hour": "strftime('%Y-%m-%d %H:00:00', scheduled_time)",
+        "day": "date(scheduled_time)",
+        "week": "date(scheduled_time, '-' || ((CAST(strftime('%w', scheduled_time) AS INTEGER) + 6) % 7) || ' days')",
+    },
+}
+
+
+def bucket_expression(bind, bucket: str) -> str:
+    """SQL expression for the start of ``bucket`` containing scheduled_time"""
+    dialect = "mysql" if bind.dialect.name == "mysql" else "sqlite"
+    return BUCKET_SQL[dialect][bucket]
+
+
+def floor_bucket(moment: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = datetime.combine(moment.date(), time.min)
+    if bucket == "week":
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def bucket_step(bucket: str) -> timedelta:
+    return {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[bucket]
+
+
+def bucket_starts(start: datetime, end: datetime, bucket: str) -> List[datetime]:
+    """Starts of the buckets covering [start, end), widened to whole buckets"""
+    step = bucket_step(bucket)
+    current = floor_bucket(start, bucket)
+    starts = []
+    while current < end:
+        starts.append(current)
+        current += step
+    return starts
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return datetime.fromisoformat(str(value))
+
+
+def query_bucket_counts(db: Session, start: datetime, end: datetime, bucket: str,
+                        status: Optional[str] = None) -> Dict[datetime, int]:
+    """Visit counts per bucket for [start, end) from one range scan.
+
+    The range predicate stays on the bare column so ix_visits_scheduled_time
+    serves it; only the grouping key is computed.
+    """
+    bucket_expr = bucket_expression(db.get_bind(), bucket)
+    status_predicate = "AND status = :status" if status is not None else ""
+    result = db.execute(text(f"""
+        SELECT {bucket_expr} AS bucket, COUNT(*) AS count
+        FROM visits
+        WHERE scheduled_time >= :start AND scheduled_time < :end {status_predicate}
+        GROUP BY bucket
+    """), {"start": start, "end": end, "status": status})
+    return {_as_datetime(bucket_start): int(count) for bucket_start, count in result}
+
+
+class ClosedBucketCache:
+    """LRU of counts for settled buckets, each kept for ``ttl`` seconds.
+
+    A visit can still change status after its bucket has closed, so entries
+    expire (no ``ttl`` keeps them until evicted); the size bound keeps
+    multi-year hourly ranges from growing without limit.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            count, stored_at = entry
+            if self.ttl is not None and monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count
+
+    def put(self, key: Tuple, count: int) -> None:
+        with self._lock:
+            self._entries[key] = (count, monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+closed_buckets = ClosedBucketCache(settings.TIMESERIES_CACHE_SIZE, settings.TIMESERIES_CACHE_TTL)
+
+
+def build_visit_timeseries(db: Session, start: datetime, end: datetime, bucket: str,
+                           status: Optional[str] = None, now: Optional[datetime] = None,
+                           cache: ClosedBucketCache = closed_buckets,
+                           settle: Optional[float] = None) -> List[Dict]:
+    """Bucketed visit counts, querying only buckets missing from the cache.
+
+    Only buckets that ended ``settle`` seconds before ``now`` are cached, and
+    on a replica that horizon moves back by its lag; with the lag unknown
+    nothing is cached. Everything that needs a query is fetched with a
+    single range scan spanning the first to the last such bucket.
+    """
+    now = now or facility_now()
+    settle = settings.TIMESERIES_CACHE_SETTLE if settle is None else settle
+    lag = session_lag(db)
+    # Buckets ending after this may still change (or not have replicated yet)
+    settled = None if lag is None else now - timedelta(seconds=settle + lag)
+    step = bucket_step(bucket)
+    starts = bucket_starts(start, end, bucket)
+    counts: Dict[datetime, int] = {}
+    pending = []
+    for bucket_start in starts:
+        cacheable = settled is not None and bucket_start + step <= settled
+        cached = cache.get((bucket, status, bucket_start)) if cacheable else None
+        if cached is None:
+            pending.append(bucket_start)
+        else:
+            counts[bucket_start] = cached
+    if pending:
+        fetched = query_bucket_counts(db, pending[0], pending[-1] + step, bucket, status)
+        for bucket_start in pending:
+            count = fetched.get(bucket_start, 0)
+            counts[bucket_start] = count
+            if settled is not None and bucket_start + step <= settled:
+                cache.put((bucket, status, bucket_start), count)
+    return [{"bucket": s.isoformat(), "count": counts[s]} for s in starts]
+
+
+async def visit_timeseries(start: datetime, end: datetime, bucket: str,
+                           status: Optional[str] = None) -> List[Dict]:
+    if (end - floor_bucket(start, bucket)) / bucket_step(bucket) > settings.TIMESERIES_MAX_BUCKETS:
+        raise ValueError(f"range spans more than {settings.TIMESERIES_MAX_BUCKETS} {bucket} buckets")
+    return await run_in_read_session(build_visit_timeseries, start, end, bucket, status)
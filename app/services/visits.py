@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.visit_fields import VisitFields, visit_fields
+
+
+def visit_projection(fields: VisitFields = visit_fields) -> Dict[str, int]:
+    return {
+        "patientName": 1,
+        "scheduledTime": 1,
+        "status": 1,
+        "visitType": 1,
+        **fields.task_projection(),
+    }
+
+
+def visits_query(start: datetime, end: datetime, staff_id: Optional[str] = None,
+                 fields: VisitFields = visit_fields) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"scheduledTime": {"$gte": start, "$lt": end}}
+    if staff_id:
+        query[fields.staff] = staff_id
+    return query
+
+
+async def stream_visits_ndjson(collection, query: Dict[str, Any],
+                               fields: VisitFields = visit_fields) -> AsyncIterator[bytes]:
+    """Yield visits matching ``query`` as NDJSON lines, straight from the cursor"""
+    # The staff field is included so cross-staff streams can be told apart
+    projection = {**visit_projection(fields), fields.staff: 1}
+    cursor = collection.find(query, projection) \
+        .sort("scheduledTime", 1) \
+        .batch_size(settings.VISIT_STREAM_BATCH_SIZE)
+    try:
+        async for visit in cursor:
+            yield dumps(visit) + b"\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        yield dumps({"error": str(e)}) + b"\n"
+    finally:
+        await cursor.close()
@@ -0,0 +1,114 @@
+"""
+Dashboard Statistics Benchmark
+
+Compares the original six-query /dashboard/stats implementation with
+the current grouped implementation on a seeded SQLite stand-in and
+reports round trips and latency per call.
+
+Usage:
+    python scripts/bench_dashboard.py --patients 2000 --visits 200000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.services.aggregates import query_dashboard_stats
+from bench_seed import register_mysql_functions, seed_sqlite
+
+
+def legacy_dashboard_stats(db):
+    """The original implementation: six separate round trips"""
+    total_patients = db.execute("SELECT COUNT(*) FROM patients").scalar() or 0
+    total_visits = db.execute("SELECT COUNT(*) FROM visits").scalar() or 0
+    today_visits = db.execute("""
+        SELECT COUNT(*) FROM visits 
+        WHERE DATE(scheduled_time) = CURDATE()
+    """).scalar() or 0
+    critical_patients = db.execute("""
+        SELECT COUNT(*) FROM patients 
+        WHERE status = 'Critical'
+    """).scalar() or 0
+    patients_by_status = db.execute("""
+        SELECT status, COUNT(*) as count 
+        FROM patients 
+        GROUP BY status
+    """)
+    patient_status_data = [{"status": r[0], "count": int(r[1])} for r in patients_by_status]
+    visits_by_status = db.execute("""
+        SELECT status, COUNT(*) as count 
+        FROM visits 
+        GROUP BY status
+    """)
+    visit_status_data = [{"status": r[0], "count": int(r[1])} for r in visits_by_status]
+    return {
+        "overview": {
+            "total_patients": int(total_patients),
+            "total_visits": int(total_visits),
+            "today_visits": int(today_visits),
+            "critical_patients": int(critical_patients)
+        },
+        "patients_by_status": patient_status_data,
+        "visits_by_status": visit_status_data
+    }
+
+
+def run(engine, fn, iterations):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine, 'before_cursor_execute', listener)
+    
+    timings = []
+    result = None
+    try:
+        for _ in range(iterations):
+            with Session(engine) as db:
+                start = time.perf_counter()
+                result = fn(db)
+                timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    
+    return result, len(statements) / iterations, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--patients', type=int, default=2000)
+    parser.add_argument('--visits', type=int, default=200000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bench.db'
+        print(f'Seeding {args.patients} patients and {args.visits} visits...')
+        seed_sqlite(db_path, patients=args.patients, visits=args.visits)
+        
+        engine = create_engine(f'sqlite:///{db_path}')
+        event.listen(engine, 'connect', register_mysql_functions)
+        
+        results = {}
+        for name, fn in (('before', legacy_dashboard_stats), ('after', query_dashboard_stats)):
+            payload, round_trips, timings = run(engine, fn, args.iterations)
+            results[name] = payload
+            timings.sort()
+            print(f'{name:>6}: {round_trips:.0f} round trips/call, '
+                  f'mean {statistics.mean(timings):.2f} ms, '
+                  f'p50 {timings[len(timings) // 2]:.2f} ms, '
+                  f'p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+        
+        if results['before'] != results['after']:
+            print('WARNING: payloads differ between implementations')
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+JSON Serialization Benchmark
+
+Compares the previous serialization of a large /staff/{staff_id}/visits/today
+payload (ObjectIds stringified by hand, then jsonable_encoder + json.dumps
+in FastAPI or the default provider in Flask) with the orjson-based
+serialization now used by both apps.
+
+Usage:
+    python scripts/bench_json.py --visits-per-staff 500 --tasks-per-visit 10
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import mongomock
+from fastapi.encoders import jsonable_encoder
+
+from app.core.serialization import dumps
+from app.services.visits import visit_projection
+from bench_seed import seed_visit_data
+
+
+def fastapi_before(visits):
+    for visit in visits:
+        visit['_id'] = str(visit['_id'])
+    content = jsonable_encoder({'data': visits})
+    # starlette JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def flask_before(provider):
+    def serialize(visits):
+        for visit in visits:
+            visit['_id'] = str(visit['_id'])
+        return provider.dumps({'data': visits}).encode('utf-8')
+    return serialize
+
+
+def after(visits):
+    return dumps({'data': visits})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--visits-per-staff', type=int, default=500)
+    parser.add_argument('--tasks-per-visit', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    
+    collection = mongomock.MongoClient().db.visit_data
+    seed_visit_data(collection, staff=1, visits_per_staff=args.visits_per_staff,
+                    tasks_per_visit=args.tasks_per_visit)
+    
+    def fetch():
+        # Fresh documents per run: the "before" paths mutate _id in place
+        return list(collection.find({'assignedStaffId': 'staff-1'}, visit_projection()))
+    
+    candidates = [('fastapi before', fastapi_before)]
+    try:
+        from flask import Flask
+        from flask.json.provider import DefaultJSONProvider
+        candidates.append(('flask before', flask_before(DefaultJSONProvider(Flask(__name__)))))
+    except ImportError:
+        pass
+    candidates.append(('orjson after', after))
+    
+    print(f'{args.visits_per_staff} visits x {args.tasks_per_visit} tasks, {args.iterations} iterations')
+    for name, serialize in candidates:
+        timings = []
+        for _ in range(args.iterations):
+            visits = fetch()
+            start = time.perf_counter()
+            body = serialize(visits)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f'{name:>15}: {len(body) / 1024:8.1f} KiB, '
+              f'mean {statistics.mean(timings):7.2f} ms, '
+              f'p50 {timings[len(timings) // 2]:7.2f} ms, '
+              f'p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
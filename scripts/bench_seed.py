@@ -0,0 +1,107 @@
+"""
+Benchmark Data Seeder for Analytics Service
+
+Builds a SQLite stand-in for the nursing home MySQL schema and fills
+it with synthetic patients and visits so the analytics queries can be
+benchmarked without a live database.
+"""
+
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+
+PATIENT_STATUSES = ['Stable', 'Critical', 'Recovering', 'Discharged']
+VISIT_STATUSES = ['scheduled', 'in_progress', 'completed', 'cancelled']
+
+
+def _curdate():
+    return date.today().isoformat()
+
+
+def register_mysql_functions(dbapi_conn, connection_record=None):
+    """Provide the MySQL date functions the analytics SQL relies on"""
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        dbapi_conn.create_function('CURDATE', 0, _curdate)
+
+
+def seed_sqlite(path, patients=1000, visits=100000, days=365, seed=42):
+    """Create and populate a SQLite database at ``path``"""
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        DROP TABLE IF EXISTS patients;
+        DROP TABLE IF EXISTS visits;
+        CREATE TABLE patients (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            status TEXT,
+            updated_at DATETIME
+        );
+        CREATE TABLE visits (
+            id INTEGER PRIMARY KEY,
+            patient_id INTEGER,
+            status TEXT,
+            scheduled_time DATETIME,
+            updated_at DATETIME
+        );
+    """)
+    conn.executemany(
+        'INSERT INTO patients VALUES (?, ?, ?, ?)',
+        ((i, f'Patient {i}', rng.choice(PATIENT_STATUSES), now.isoformat(' '))
+         for i in range(1, patients + 1))
+    )
+    
+    def visit_rows():
+        for i in range(1, visits + 1):
+            scheduled = now - timedelta(minutes=rng.randint(-24 * 60, days * 24 * 60))
+            yield (i, rng.randint(1, patients), rng.choice(VISIT_STATUSES),
+                   scheduled.isoformat(' '), now.isoformat(' '))
+    
+    conn.executemany('INSERT INTO visits VALUES (?, ?, ?, ?, ?)', visit_rows())
+    conn.commit()
+    conn.close()
+
+
+TASK_CATEGORIES = ['medication', 'hygiene', 'nutrition', 'mobility', 'vitals']
+
+
+def seed_visit_data(collection, staff=40, visits_per_staff=20, tasks_per_visit=8, seed=42,
+                    legacy_fields=False):
+    """Insert today's visit documents into a MongoDB (or mongomock) collection.
+    
+    With ``legacy_fields`` each document also carries the nurseId and
+    taskCompletions fields read by the Flask app.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    docs = []
+    for s in range(1, staff + 1):
+        staff_id = f'staff-{s}'
+        for v in range(visits_per_staff):
+            scheduled = today + timedelta(minutes=rng.randint(0, 24 * 60 - 1))
+            tasks = [{
+                'taskTitle': f'Task {t}',
+                'taskCategory': rng.choice(TASK_CATEGORIES),
+                'status': rng.choice(['completed', 'pending']),
+                'priority': rng.choice(['high', 'medium', 'low']),
+                'notes': 'Observed and documented per care plan. ' * 3,
+            } for t in range(tasks_per_visit)]
+            docs.append({
+                'assignedStaffId': staff_id,
+                'patientName': f'Patient {rng.randint(1, 500)}',
+                'scheduledTime': scheduled,
+                'status': rng.choice(VISIT_STATUSES),
+                'visitType': 'routine',
+                'tasks': tasks,
+            })
+            if legacy_fields:
+                docs[-1]['nurseId'] = staff_id
+                docs[-1]['taskCompletions'] = [
+                    {'completed': task['status'] == 'completed', 'priority': task['priority']}
+                    for task in tasks
+                ]
+    collection.insert_many(docs)
+    return len(docs)
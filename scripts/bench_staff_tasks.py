@@ -0,0 +1,98 @@
+"""
+Staff Task Summary Benchmark
+
+Compares the original find-and-count-in-Python implementation of
+/staff/{staff_id}/tasks/today with the server-side aggregation on a
+mongomock stand-in, reporting BSON bytes returned and latency.
+mongomock evaluates pipelines in Python, so its latency overstates the
+aggregation cost; the bytes column is what carries over to mongod.
+
+Usage:
+    python scripts/bench_staff_tasks.py --visits-per-staff 50 --tasks-per-visit 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bson
+import mongomock
+
+from app.services.staff_tasks import task_summary, task_summary_pipeline
+from bench_seed import seed_visit_data
+
+
+def legacy_summary(collection, staff_id, start, end):
+    """The original implementation: fetch every visit and count in Python"""
+    visits = list(collection.find({
+        "assignedStaffId": staff_id,
+        "scheduledTime": {"$gte": start, "$lt": end}
+    }))
+    total_tasks = completed_tasks = pending_tasks = high_priority_pending = 0
+    for visit in visits:
+        tasks = visit.get("tasks", [])
+        total_tasks += len(tasks)
+        for task in tasks:
+            if task.get("status") == "completed":
+                completed_tasks += 1
+            else:
+                pending_tasks += 1
+                if task.get("priority") == "high":
+                    high_priority_pending += 1
+    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    data = {
+        "totalTasks": total_tasks,
+        "completedTasks": completed_tasks,
+        "pendingTasks": pending_tasks,
+        "highPriorityPending": high_priority_pending,
+        "totalVisits": len(visits),
+        "completionRate": round(completion_rate, 1)
+    }
+    return data, visits
+
+
+def aggregated_summary(collection, staff_id, start, end):
+    result = list(collection.aggregate(task_summary_pipeline(staff_id, start, end)))
+    return task_summary(result[0] if result else None), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--staff', type=int, default=10)
+    parser.add_argument('--visits-per-staff', type=int, default=50)
+    parser.add_argument('--tasks-per-visit', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    
+    collection = mongomock.MongoClient().analytics.visit_data
+    seeded = seed_visit_data(collection, staff=args.staff,
+                             visits_per_staff=args.visits_per_staff,
+                             tasks_per_visit=args.tasks_per_visit)
+    print(f'Seeded {seeded} visits with {args.tasks_per_visit} tasks each')
+    
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=1)
+    
+    payloads = {}
+    for name, fn in (('before', legacy_summary), ('after', aggregated_summary)):
+        timings = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            payload, docs = fn(collection, 'staff-1', start, end)
+            timings.append((time.perf_counter() - t0) * 1000)
+        payloads[name] = payload
+        transferred = sum(len(bson.encode(doc)) for doc in docs)
+        print(f'{name:>6}: {len(docs)} documents, {transferred} BSON bytes returned, '
+              f'mean {statistics.mean(timings):.2f} ms')
+    
+    if payloads['before'] != payloads['after']:
+        print('WARNING: payloads differ between implementations')
+
+
+if __name__ == '__main__':
+    main()
@@ -49,6 +49,111 @@ def generate_report():
             'name': 'Database Connection Tests',
             'file': 'test_database.py',
             'tests': 3
+        },
+        'S5.TS7': {
+            'name': 'Concurrency Tests',
+            'file': 'test_concurrency.py',
+            'tests': 2
+        },
+        'S5.TS8': {
+            'name': 'Aggregate Cache Tests',
+            'file': 'test_cache.py',
+            'tests': 4
+        },
+        'S5.TS9': {
+            'name': 'Index Usage Tests',
+            'file': 'test_indexes.py',
+            'tests': 3
+        },
+        'S5.TS10': {
+            'name': 'Staff Task Tests',
+            'file': 'test_staff_tasks.py',
+            'tests': 4
+        },
+        'S5.TS11': {
+            'name': 'Staff Visit Tests',
+            'file': 'test_staff_visits.py',
+            'tests': 4
+        },
+        'S5.TS12': {
+            'name': 'Metrics Tests',
+            'file': 'test_metrics.py',
+            'tests': 4
+        },
+        'S5.TS13': {
+            'name': 'Status Counter Tests',
+            'file': 'test_counters.py',
+            'tests': 4
+        },
+        'S5.TS14': {
+            'name': 'Payload Snapshot Tests',
+            'file': 'test_snapshots.py',
+            'tests': 5
+        },
+        'S5.TS15': {
+            'name': 'HTTP Caching Tests',
+            'file': 'test_http_cache.py',
+            'tests': 3
+        },
+        'S5.TS16': {
+            'name': 'Visit Time-Series Tests',
+            'file': 'test_timeseries.py',
+            'tests': 5
+        },
+        'S5.TS17': {
+            'name': 'Daily Rollup Tests',
+            'file': 'test_rollups.py',
+            'tests': 5
+        },
+        'S5.TS18': {
+            'name': 'Columnar Engine Tests',
+            'file': 'test_columnar.py',
+            'tests': 5
+        },
+        'S5.TS19': {
+            'name': 'Connection Pool Tests',
+            'file': 'test_pool.py',
+            'tests': 3
+        },
+        'S5.TS20': {
+            'name': 'JSON Serialization Tests',
+            'file': 'test_serialization.py',
+            'tests': 3
+        },
+        'S5.TS21': {
+            'name': 'Keyset Listing Tests',
+            'file': 'test_listings.py',
+            'tests': 4
+        },
+        'S5.TS22': {
+            'name': 'Live Update Tests',
+            'file': 'test_live.py',
+            'tests': 4
+        },
+        'S5.TS23': {
+            'name': 'Staff Task Range Tests',
+            'file': 'test_staff_range.py',
+            'tests': 4
+        },
+        'S5.TS24': {
+            'name': 'Day Window Tests',
+            'file': 'test_dates.py',
+            'tests': 3
+        },
+        'S5.TS25': {
+            'name': 'Query Registry Tests',
+            'file': 'test_queries.py',
+            'tests': 3
+        },
+        'S5.TS26': {
+            'name': 'Read Replica Tests',
+            'file': 'test_replicas.py',
+            'tests': 5
+        },
+        'S5.TS27': {
+            'name': 'visit_data Index Tests',
+            'file': 'test_mongo_indexes.py',
+            'tests': 3
         }
     }
     
@@ -141,6 +246,128 @@ def generate_report():
             report.append('- S5.TS6.1: MySQL connection established')
             report.append('- S5.TS6.2: Database queries execute correctly')
             report.append('- S5.TS6.3: Connection errors handled')
+        elif suite_id == 'S5.TS7':
+            report.append('**Tests:**')
+            report.append('- S5.TS7.1: Queries run off the event loop')
+            report.append('- S5.TS7.2: Concurrent queries overlap')
+        elif suite_id == 'S5.TS8':
+            report.append('**Tests:**')
+            report.append('- S5.TS8.1: Concurrent misses run one query')
+            report.append('- S5.TS8.2: Entries expire after their TTL')
+            report.append('- S5.TS8.3: Failures are not cached')
+            report.append('- S5.TS8.4: Cache stats endpoint reports counters')
+        elif suite_id == 'S5.TS9':
+            report.append('**Tests:**')
+            report.append('- S5.TS9.1: Index bootstrap creates indexes once')
+            report.append('- S5.TS9.2: Today\'s visits query uses the scheduled_time index')
+            report.append('- S5.TS9.3: Today range counts only today\'s visits')
+        elif suite_id == 'S5.TS10':
+            report.append('**Tests:**')
+            report.append('- S5.TS10.1: Task summary is counted server-side')
+            report.append('- S5.TS10.2: Summary without visits is zero')
+            report.append('- S5.TS10.3: Batch summary groups by staff')
+            report.append('- S5.TS10.4: Batch endpoint requires staff IDs')
+        elif suite_id == 'S5.TS11':
+            report.append('**Tests:**')
+            report.append('- S5.TS11.1: Staff visits today returns projected visits')
+            report.append('- S5.TS11.2: Visit stream emits NDJSON')
+            report.append('- S5.TS11.3: Flask field mapping')
+            report.append('- S5.TS11.4: Flask stream matches listing')
+        elif suite_id == 'S5.TS12':
+            report.append('**Tests:**')
+            report.append('- S5.TS12.1: Metrics endpoint reports route latency')
+            report.append('- S5.TS12.2: Statement labels are normalized')
+            report.append('- S5.TS12.3: Mongo listener records command latency')
+            report.append('- S5.TS12.4: Failed statement leaves no timing state')
+        elif suite_id == 'S5.TS13':
+            report.append('**Tests:**')
+            report.append('- S5.TS13.1: Seed matches GROUP BY')
+            report.append('- S5.TS13.2: Delta scan moves changed rows')
+            report.append('- S5.TS13.3: Reconcile detects and repairs drift')
+            report.append('- S5.TS13.4: Reconcile ignores case and transient drift')
+        elif suite_id == 'S5.TS14':
+            report.append('**Tests:**')
+            report.append('- S5.TS14.1: Fresh snapshot skips producer')
+            report.append('- S5.TS14.2: Stale snapshot is not served')
+            report.append('- S5.TS14.3: Dashboard reports generation time')
+            report.append('- S5.TS14.4: Disabled snapshots are always live')
+            report.append('- S5.TS14.5: Generation time is when data was read')
+        elif suite_id == 'S5.TS15':
+            report.append('**Tests:**')
+            report.append('- S5.TS15.1: Matching ETag returns 304')
+            report.append('- S5.TS15.2: max-age is configurable per route')
+            report.append('- S5.TS15.3: Snapshot ETag ignores generation time')
+        elif suite_id == 'S5.TS16':
+            report.append('**Tests:**')
+            report.append('- S5.TS16.1: Day buckets include empty days')
+            report.append('- S5.TS16.2: Week buckets start on Monday')
+            report.append('- S5.TS16.3: Only open buckets are recomputed')
+            report.append('- S5.TS16.4: Cache waits for buckets to settle')
+            report.append('- S5.TS16.5: Offsets and reversed ranges')
+        elif suite_id == 'S5.TS17':
+            report.append('**Tests:**')
+            report.append('- S5.TS17.1: Re-running a day replaces its rows')
+            report.append('- S5.TS17.2: Range combines rollup and raw tail')
+            report.append('- S5.TS17.3: Staff task rollup round trip')
+            report.append('- S5.TS17.4: Gaps are read from raw rows')
+            report.append('- S5.TS17.5: Missing tables fall back to raw')
+        elif suite_id == 'S5.TS18':
+            report.append('**Tests:**')
+            report.append('- S5.TS18.1: Chunked load matches GROUP BY')
+            report.append('- S5.TS18.2: Multi-dimension breakdown')
+            report.append('- S5.TS18.3: Filters narrow the breakdown')
+            report.append('- S5.TS18.4: Breakdown runs off the event loop')
+            report.append('- S5.TS18.5: Offset-aware bounds')
+        elif suite_id == 'S5.TS19':
+            report.append('**Tests:**')
+            report.append('- S5.TS19.1: Factory applies pool settings')
+            report.append('- S5.TS19.2: Idle ping replaces dead connections')
+            report.append('- S5.TS19.3: Checkout wait is recorded')
+        elif suite_id == 'S5.TS20':
+            report.append('**Tests:**')
+            report.append('- S5.TS20.1: dumps handles database types')
+            report.append('- S5.TS20.2: App uses orjson response class')
+            report.append('- S5.TS20.3: Staff visits serialize raw documents')
+        elif suite_id == 'S5.TS21':
+            report.append('**Tests:**')
+            report.append('- S5.TS21.1: Visit pages cover every row once')
+            report.append('- S5.TS21.2: Filters and patient listing')
+            report.append('- S5.TS21.3: Invalid cursor is rejected')
+            report.append('- S5.TS21.4: Offset-aware bounds use facility time')
+        elif suite_id == 'S5.TS22':
+            report.append('**Tests:**')
+            report.append('- S5.TS22.1: Merge patch diffs nested state')
+            report.append('- S5.TS22.2: One producer call per tick for all subscribers')
+            report.append('- S5.TS22.3: Slow subscriber is resynced')
+            report.append('- S5.TS22.4: visit_data counts follow the facility day')
+        elif suite_id == 'S5.TS23':
+            report.append('**Tests:**')
+            report.append('- S5.TS23.1: Range merges past days with today')
+            report.append('- S5.TS23.2: Cached days are not recomputed')
+            report.append('- S5.TS23.3: Staff tasks endpoint')
+            report.append('- S5.TS23.4: Recent days stay live')
+        elif suite_id == 'S5.TS24':
+            report.append('**Tests:**')
+            report.append('- S5.TS24.1: Windows for SQL and MongoDB')
+            report.append('- S5.TS24.2: Today is computed once per day')
+            report.append('- S5.TS24.3: Facility timezone setting')
+        elif suite_id == 'S5.TS25':
+            report.append('**Tests:**')
+            report.append('- S5.TS25.1: Statements reuse the compiled cache')
+            report.append('- S5.TS25.2: Flask and FastAPI agree')
+            report.append('- S5.TS25.3: Counter statements per table')
+        elif suite_id == 'S5.TS26':
+            report.append('**Tests:**')
+            report.append('- S5.TS26.1: Round robin over healthy replicas')
+            report.append('- S5.TS26.2: Failed replica falls back to primary')
+            report.append('- S5.TS26.3: Fresh counts skip lagging replicas')
+            report.append('- S5.TS26.4: Query errors do not fail over')
+            report.append('- S5.TS26.5: Lag bound counts sample age')
+        elif suite_id == 'S5.TS27':
+            report.append('**Tests:**')
+            report.append('- S5.TS27.1: Creates expected indexes')
+            report.append('- S5.TS27.2: Second run is idempotent')
+            report.append('- S5.TS27.3: Unreachable Mongo does not block startup')
         
         report.append('')
     
@@ -171,11 +398,45 @@ def generate_report():
     report.append('# Run specific test file')
     report.append('pytest tests/test_health.py')
     report.append('')
+    report.append('# Benchmark every route (results feed this report)')
+    report.append('python scripts/benchmark.py --visits 100000 --concurrency 16')
+    report.append('')
     report.append('# Generate this report')
     report.append('python scripts/generate_report.py')
     report.append('```')
     report.append('')
     
+    # Performance Benchmarks
+    report.append('## PERFORMANCE BENCHMARKS')
+    report.append('')
+    benchmark_file = reports_dir / 'benchmark-results.json'
+    benchmark = None
+    if benchmark_file.exists():
+        try:
+            with open(benchmark_file) as f:
+                benchmark = json.load(f)
+        except Exception:
+            report.append(f'Could not read {benchmark_file.name}')
+            report.append('')
+    if benchmark:
+        config = benchmark.get('config', {})
+        report.append(f'Run: {benchmark.get("generated_at", "N/A")}')
+        report.append(f'Data: {config.get("database")}, {config.get("visits") or "existing"} visits; '
+                      f'{config.get("mongodb")}')
+        report.append(f'Load: {config.get("requests_per_route")} requests per route, '
+                      f'concurrency {config.get("concurrency")}')
+        report.append('')
+        report.append(f'{"App":<8} {"Route":<58} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"req/s":>9}')
+        for result in benchmark.get('results', []):
+            errors = f'  ({result["errors"]} errors)' if result.get('errors') else ''
+            report.append(f'{result["app"]:<8} {result["route"]:<58} {result["p50_ms"]:>9.2f} '
+                          f'{result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+                          f'{result["throughput_rps"] or 0:>9.1f}{errors}')
+        report.append('')
+    else:
+        report.append('Run benchmarks with: python scripts/benchmark.py')
+        report.append('')
+    
     # Recommendations
     report.append('## RECOMMENDATIONS')
     report.append('')
@@ -183,7 +444,15 @@ def generate_report():
     report.append('2. Maintain test coverage above 80%')
     report.append('3. Add integration tests with real database')
     report.append('4. Test with different data volumes')
-    report.append('5. Add performance benchmarks')
+    if benchmark:
+        slowest = max(benchmark.get('results', []), key=lambda r: r['p95_ms'], default=None)
+        if slowest:
+            report.append(f'5. Re-run scripts/benchmark.py after performance changes; slowest p95: '
+                          f'{slowest["app"]} {slowest["route"]} ({slowest["p95_ms"]:.2f} ms)')
+        else:
+            report.append('5. Re-run scripts/benchmark.py after performance changes')
+    else:
+        report.append('5. Run performance benchmarks (python scripts/benchmark.py)')
     report.append('6. Test concurrent request handling')
     report.append('')
     
@@ -0,0 +1,73 @@
+"""
+Daily Rollup Job for Analytics Service
+
+Writes per-day visit counts by status (from MySQL visits) and per-day
+task counters by staff member (from MongoDB visit_data) into the
+visit_daily_rollup and staff_task_daily_rollup tables. Each day is
+deleted and rewritten in one transaction, so re-runs are idempotent.
+Run nightly to re-roll the last ROLLUP_SETTLE_DAYS + 1 days (late status
+changes land in the next runs), or on demand for a backfill.
+
+Usage:
+    python scripts/rollup.py [--from YYYY-MM-DD] [--to YYYY-MM-DD] [--dsn DSN]
+                             [--mongo-uri URI] [--skip-staff]
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo import MongoClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dates import facility_today, utc_day_bounds
+from app.services.rollups import ensure_rollup_tables, iter_days, rollup_staff_task_day, rollup_visit_day
+from app.services.staff_tasks import all_staff_task_summary_pipeline
+
+
+def main():
+    today = facility_today()
+    unsettled = today - timedelta(days=settings.ROLLUP_SETTLE_DAYS + 1)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--from', dest='start', type=date.fromisoformat, default=unsettled,
+                        help='first day to roll up (default: ROLLUP_SETTLE_DAYS + 1 days ago)')
+    parser.add_argument('--to', dest='end', type=date.fromisoformat, default=today,
+                        help='day after the last one to roll up (default: today)')
+    parser.add_argument('--dsn', default=settings.MYSQL_DSN, help='database URL (default: MYSQL_DSN)')
+    parser.add_argument('--mongo-uri', default=settings.MONGODB_URI, help='MongoDB URI (default: MONGODB_URI)')
+    parser.add_argument('--skip-staff', action='store_true', help='only roll up MySQL visits')
+    args = parser.parse_args()
+    
+    # Today is still changing; its rollup would be partial
+    end = min(args.end, today)
+    if args.start >= end:
+        print(f'✗ nothing to roll up before today in [{args.start}, {args.end})')
+        sys.exit(1)
+    
+    engine = create_engine(args.dsn)
+    ensure_rollup_tables(engine)
+    mongo = None if args.skip_staff else MongoClient(args.mongo_uri)
+    
+    with Session(engine) as db:
+        for day in iter_days(args.start, end):
+            visits = rollup_visit_day(db, day)
+            line = f'✓ {day}: {visits} visits'
+            if mongo is not None:
+                day_start, day_end = utc_day_bounds(day)
+                pipeline = all_staff_task_summary_pipeline(day_start, day_end)
+                summaries = mongo[settings.MONGODB_DB].visit_data.aggregate(pipeline)
+                line += f', {rollup_staff_task_day(db, day, summaries)} staff'
+            print(line)
+    
+    if mongo is not None:
+        mongo.close()
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
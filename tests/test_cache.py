@@ -0,0 +1,123 @@
+"""
+Analytics Service - Aggregate Cache Tests
+Test Suite: S5.TS8
+
+Tests the shared TTL cache used for status-count aggregates,
+including expiry, single-flight and hit/miss reporting.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.cache import AggregateCache
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestAggregateCache:
+    """S5.TS8: Aggregate Cache Tests"""
+    
+    def test_concurrent_misses_run_one_query(self):
+        """
+        Test: S5.TS8.1
+        Verify that concurrent misses on one key share a single computation
+        
+        Expected behavior:
+        - Ten concurrent lookups trigger one compute call
+        - All callers receive the same value
+        """
+        cache = AggregateCache(default_ttl=60)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [{"status": "Stable", "count": 3}]
+        
+        async def main():
+            return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(10)))
+        
+        results = asyncio.run(main())
+        
+        assert len(calls) == 1
+        assert all(r == results[0] for r in results)
+        assert cache.stats()["keys"]["k"]["coalesced"] == 9
+    
+    def test_entries_expire_after_ttl(self):
+        """
+        Test: S5.TS8.2
+        Verify that per-key TTLs are honored
+        
+        Expected behavior:
+        - A key with a zero TTL is never cached
+        - A key with a positive TTL is served from cache until it expires
+        """
+        cache = AggregateCache(default_ttl=60, ttls={"uncached": 0, "short": 0.05})
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return len(calls)
+        
+        async def main():
+            await cache.get_or_compute("uncached", compute)
+            await cache.get_or_compute("uncached", compute)
+            first = await cache.get_or_compute("short", compute)
+            cached = await cache.get_or_compute("short", compute)
+            await asyncio.sleep(0.06)
+            expired = await cache.get_or_compute("short", compute)
+            return first, cached, expired
+        
+        first, cached, expired = asyncio.run(main())
+        
+        assert len(calls) == 4
+        assert first == cached
+        assert expired != first
+    
+    def test_failures_are_not_cached(self):
+        """
+        Test: S5.TS8.3
+        Verify that a failed computation is retried on the next lookup
+        
+        Expected behavior:
+        - The error propagates to the caller
+        - The next lookup computes again and caches the result
+        """
+        cache = AggregateCache(default_ttl=60)
+        attempts = []
+        
+        async def compute():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("connection lost")
+            return 42
+        
+        async def main():
+            with pytest.raises(RuntimeError):
+                await cache.get_or_compute("k", compute)
+            return await cache.get_or_compute("k", compute)
+        
+        assert asyncio.run(main()) == 42
+        assert cache.stats()["misses"] == 2
+    
+    def test_cache_stats_endpoint_reports_counters(self):
+        """
+        Test: S5.TS8.4
+        Verify that the cache stats endpoint reports hit and miss counters
+        
+        Expected behavior:
+        - Status code should be 200
+        - Data should include totals and per-key counters
+        """
+        client.get("/api/analytics/patients/summary")
+        client.get("/api/analytics/patients/critical")
+        
+        response = client.get("/api/analytics/cache/stats")
+        
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert "hits" in data
+        assert "misses" in data
+        assert "patients:status_counts" in data["keys"]
@@ -0,0 +1,153 @@
+"""
+Analytics Service - Columnar Engine Tests
+Test Suite: S5.TS18
+
+Tests the in-memory columnar snapshot: chunked loading with dictionary
+encoded statuses, and vectorized breakdowns checked against SQL on a
+SQLite stand-in.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+np = pytest.importorskip("numpy")
+
+from app.core import dates
+from app.services import columnar
+from app.services.columnar import breakdown, load_snapshot, visit_breakdown
+
+VISITS = [
+    (1, 1, "completed", datetime(2026, 3, 2, 9, 15)),
+    (2, 1, "missed", datetime(2026, 3, 2, 9, 45)),
+    (3, 2, "completed", datetime(2026, 3, 3, 14, 0)),
+    (4, 3, "completed", datetime(2026, 3, 4, 9, 30)),
+    (5, 9, "scheduled", None),
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE patients (id INTEGER PRIMARY KEY, status TEXT)"))
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, scheduled_time DATETIME)"
+        ))
+        for patient_id, status in [(3, "Stable"), (1, "Critical"), (2, "Stable")]:
+            conn.execute(text("INSERT INTO patients VALUES (:id, :status)"), {"id": patient_id, "status": status})
+        for visit_id, patient_id, status, scheduled in VISITS:
+            conn.execute(
+                text("INSERT INTO visits VALUES (:id, :patient_id, :status, :t)"),
+                {"id": visit_id, "patient_id": patient_id, "status": status, "t": scheduled},
+            )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+class TestColumnarEngine:
+    """S5.TS18: Columnar Engine Tests"""
+    
+    def test_chunked_load_matches_group_by(self, db):
+        """
+        Test: S5.TS18.1
+        Verify that a load in small chunks reproduces the SQL status counts
+        
+        Expected behavior:
+        - Statuses are encoded as small ints with one dictionary per column
+        - Counts by status equal SELECT status, COUNT(*) ... GROUP BY status
+        """
+        snapshot = load_snapshot(db, chunk_size=2)
+        expected = {r[0]: r[1] for r in db.execute(text("SELECT status, COUNT(*) FROM visits GROUP BY status"))}
+        
+        assert snapshot.visit_status.dtype == np.uint16
+        assert sorted(snapshot.status_values) == sorted(expected)
+        assert {r["status"]: r["count"] for r in breakdown(snapshot, ["status"])} == expected
+    
+    def test_multi_dimension_breakdown(self, db):
+        """
+        Test: S5.TS18.2
+        Verify grouping by patient status and hour of day
+        
+        Expected behavior:
+        - Visits are joined to their patient's status
+        - Visits without scheduled_time are left out of time dimensions
+        """
+        snapshot = load_snapshot(db, chunk_size=2)
+        
+        assert breakdown(snapshot, ["patient_status", "hour"]) == [
+            {"patient_status": "Critical", "hour": 9, "count": 2},
+            {"patient_status": "Stable", "hour": 9, "count": 1},
+            {"patient_status": "Stable", "hour": 14, "count": 1},
+        ]
+    
+    def test_filters_narrow_the_breakdown(self, db):
+        """
+        Test: S5.TS18.3
+        Verify status and time-range filters
+        
+        Expected behavior:
+        - Filters combine with AND
+        - An unknown status value matches nothing
+        """
+        snapshot = load_snapshot(db, chunk_size=2)
+        
+        rows = breakdown(snapshot, ["day"], start=datetime(2026, 3, 2, 9, 30),
+                         end=datetime(2026, 3, 5), status="completed")
+        assert rows == [
+            {"day": "2026-03-03", "count": 1},
+            {"day": "2026-03-04", "count": 1},
+        ]
+        assert breakdown(snapshot, [], status="no-such-status") == [{"count": 0}]
+    
+    def test_breakdown_runs_off_the_event_loop(self, db, monkeypatch):
+        """
+        Test: S5.TS18.4
+        Verify that request-time breakdowns don't run on the event loop thread
+        
+        Expected behavior:
+        - The grouping runs on a worker thread
+        - The result matches a direct breakdown
+        """
+        snapshot = load_snapshot(db, chunk_size=2)
+        threads = []
+        
+        def recording_breakdown(*args):
+            threads.append(threading.current_thread())
+            return breakdown(*args)
+        
+        monkeypatch.setattr(columnar, "breakdown", recording_breakdown)
+        
+        async def main():
+            return threading.current_thread(), await visit_breakdown(snapshot, ["status"])
+        
+        loop_thread, rows = asyncio.run(main())
+        
+        assert threads and threads[0] is not loop_thread
+        assert rows == breakdown(snapshot, ["status"])
+    
+    def test_offset_aware_bounds(self, db, monkeypatch):
+        """
+        Test: S5.TS18.5
+        Verify that from/to with an offset filter in facility time
+        
+        Expected behavior:
+        - An aware bound matches the naive facility wall-clock bound
+        - Offsets other than the facility's are converted, not dropped
+        """
+        snapshot = load_snapshot(db, chunk_size=2)
+        naive = breakdown(snapshot, ["day"], start=datetime(2026, 3, 2, 9, 30), end=datetime(2026, 3, 5))
+        
+        monkeypatch.setattr(dates, "day_windows", dates.DayWindows("Europe/Berlin"))
+        aware = breakdown(snapshot, ["day"], start=datetime(2026, 3, 2, 8, 30, tzinfo=timezone.utc),
+                          end=datetime(2026, 3, 4, 23, 0, tzinfo=timezone.utc))
+        assert aware == naive
+        
+        plus_two = timezone(timedelta(hours=2))
+        shifted = breakdown(snapshot, ["day"], start=datetime(2026, 3, 2, 9, 30, tzinfo=plus_two))
+        assert shifted[0] == {"day": "2026-03-02", "count": 2}  # 08:30 Berlin, before both visits
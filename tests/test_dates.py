@@ -0,0 +1,73 @@
+"""
+Analytics Service - Day Window Tests
+Test Suite: S5.TS24
+
+Tests facility-timezone day windows: half-open bounds for SQL and
+MongoDB, DST days, and computing today's window once per rollover.
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+from app.core.config import Settings, settings
+from app.core.dates import DayWindows
+from app.services.staff_tasks import daily_task_summary_pipeline
+
+
+class TestDayWindows:
+    """S5.TS24: Day Window Tests"""
+
+    def test_windows_for_sql_and_mongo(self):
+        """
+        Test: S5.TS24.1
+        Verify that a facility day maps to local and UTC bounds
+
+        Expected behavior:
+        - SQL bounds are naive local midnights, half-open
+        - MongoDB bounds are the same instants in UTC
+        - A DST day spans 23 hours in UTC
+        """
+        windows = DayWindows("America/New_York")
+
+        window = windows.window(date(2026, 1, 15))
+        assert (window.start, window.end) == (datetime(2026, 1, 15), datetime(2026, 1, 16))
+        assert (window.utc_start, window.utc_end) == (datetime(2026, 1, 15, 5), datetime(2026, 1, 16, 5))
+
+        spring = windows.window(date(2026, 3, 8))
+        assert spring.utc_start == datetime(2026, 3, 8, 5)
+        assert spring.utc_end == datetime(2026, 3, 9, 4)
+
+    def test_today_is_computed_once_per_day(self):
+        """
+        Test: S5.TS24.2
+        Verify that today's window is cached until the day rolls over
+
+        Expected behavior:
+        - Repeated calls return the same window object
+        - A window whose day has passed is replaced
+        """
+        windows = DayWindows("Asia/Kolkata")
+        today = windows.today()
+        assert windows.today() is today
+        assert today.utc_start <= datetime.now(timezone.utc).replace(tzinfo=None) < today.utc_end
+
+        windows._today = windows.window(date(2020, 1, 1))
+        assert windows.today().day == today.day
+
+    def test_facility_timezone_setting(self, monkeypatch):
+        """
+        Test: S5.TS24.3
+        Verify the FACILITY_TIMEZONE setting
+
+        Expected behavior:
+        - Unknown zones are rejected when settings load
+        - Per-day Mongo aggregations group days in the facility zone
+        """
+        with pytest.raises(ValidationError):
+            Settings(FACILITY_TIMEZONE="Mars/Olympus_Mons")
+
+        monkeypatch.setattr(settings, "FACILITY_TIMEZONE", "Europe/Berlin")
+        pipeline = daily_task_summary_pipeline("s1", datetime(2026, 3, 1), datetime(2026, 3, 2))
+        day = pipeline[1]["$project"]["day"]["$dateToString"]
+        assert day["timezone"] == "Europe/Berlin"
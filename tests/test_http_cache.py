@@ -0,0 +1,85 @@
+"""
+Analytics Service - HTTP Caching Tests
+Test Suite: S5.TS15
+
+Tests ETag / If-None-Match revalidation and per-route Cache-Control
+headers on the summary and dashboard endpoints.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.http_cache import HTTPCachePolicy
+from app.main import app
+from app.services.snapshots import SnapshotScheduler
+
+client = TestClient(app)
+
+
+class TestHTTPCaching:
+    """S5.TS15: HTTP Caching Tests"""
+    
+    def test_matching_etag_returns_304(self):
+        """
+        Test: S5.TS15.1
+        Verify that a repeated poll with If-None-Match is answered with 304
+        
+        Expected behavior:
+        - First response carries ETag and Cache-Control
+        - Sending the ETag back yields 304 with an empty body
+        - A different ETag yields the full 200 response
+        """
+        first = client.get("/api/analytics/patients/summary")
+        etag = first.headers["etag"]
+        
+        assert first.status_code == 200
+        assert "max-age=" in first.headers["cache-control"]
+        
+        second = client.get("/api/analytics/patients/summary", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        
+        other = client.get("/api/analytics/patients/summary", headers={"If-None-Match": '"stale"'})
+        assert other.status_code == 200
+        assert other.json() == first.json()
+    
+    def test_max_age_is_configurable_per_route(self):
+        """
+        Test: S5.TS15.2
+        Verify that per-route max-age overrides the default
+        
+        Expected behavior:
+        - Routes without an override use the default
+        - max-age=0 becomes no-cache
+        """
+        policy = HTTPCachePolicy(default_max_age=5, max_ages={"/dashboard/stats": 30, "/visits/summary": 0})
+        
+        assert policy.cache_control("/patients/summary") == "max-age=5"
+        assert policy.cache_control("/dashboard/stats") == "max-age=30"
+        assert policy.cache_control("/visits/summary") == "no-cache"
+    
+    def test_snapshot_etag_ignores_generation_time(self):
+        """
+        Test: S5.TS15.3
+        Verify that recomputing an unchanged payload keeps its ETag
+        
+        Expected behavior:
+        - Bodies differ by generated_at
+        - ETags match while the data is unchanged
+        - The tag is weak, since the bytes are not identical
+        """
+        scheduler = SnapshotScheduler(interval=60, max_age=60)
+        
+        async def producer():
+            return {"total_patients": 3}, datetime.now(timezone.utc)
+        
+        scheduler.register("p", producer)
+        first = asyncio.run(scheduler.refresh("p"))
+        second = asyncio.run(scheduler.refresh("p"))
+        
+        assert first.body != second.body
+        assert first.etag == second.etag
+        assert first.etag.startswith('W/"')
@@ -0,0 +1,97 @@
+"""
+Analytics Service - Index Usage Tests
+Test Suite: S5.TS9
+
+Tests the index bootstrap and uses EXPLAIN on a SQLite stand-in
+to check that today's-visits lookups are served by an index.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.dates import today_bounds
+from app.db.mysql import ensure_indexes, explain_index
+from app.db.queries import TODAY_VISITS_SQL
+from app.services.aggregates import query_visit_status_counts
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE patients (id INTEGER PRIMARY KEY, status TEXT, updated_at DATETIME)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, status TEXT, scheduled_time DATETIME, updated_at DATETIME)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+class TestIndexUsage:
+    """S5.TS9: Index Usage Tests"""
+    
+    def test_bootstrap_creates_indexes_once(self, engine):
+        """
+        Test: S5.TS9.1
+        Verify that the bootstrap creates missing indexes and is idempotent
+        
+        Expected behavior:
+        - First run creates every analytics index
+        - Second run creates nothing
+        """
+        created = ensure_indexes(engine)
+        
+        assert set(created) == {
+            "ix_visits_scheduled_time", "ix_visits_status", "ix_patients_status",
+            "ix_visits_updated_at", "ix_patients_updated_at",
+        }
+        assert ensure_indexes(engine) == []
+    
+    def test_today_visits_query_uses_index(self, engine):
+        """
+        Test: S5.TS9.2
+        Verify with EXPLAIN that today's visits use the scheduled_time index
+        
+        Expected behavior:
+        - Without indexes the range query has no index to use
+        - After bootstrap EXPLAIN reports ix_visits_scheduled_time
+        """
+        today_start, today_end = today_bounds()
+        params = {"today_start": today_start, "today_end": today_end}
+        
+        assert explain_index(engine, TODAY_VISITS_SQL, params) is None
+        
+        ensure_indexes(engine)
+        
+        assert explain_index(engine, TODAY_VISITS_SQL, params) == "ix_visits_scheduled_time"
+    
+    def test_today_range_counts_only_today(self, engine):
+        """
+        Test: S5.TS9.3
+        Verify that the half-open range counts today's visits only
+        
+        Expected behavior:
+        - Visits at midnight today are counted
+        - Visits at midnight tomorrow and yesterday are not
+        """
+        today_start, today_end = today_bounds()
+        with engine.begin() as conn:
+            for i, scheduled in enumerate([
+                today_start,
+                today_start + timedelta(hours=12),
+                today_end,
+                today_start - timedelta(seconds=1),
+            ]):
+                conn.execute(
+                    text("INSERT INTO visits VALUES (:id, 'scheduled', :t, :t)"),
+                    {"id": i, "t": scheduled},
+                )
+        
+        with engine.connect() as conn:
+            counts = query_visit_status_counts(conn)
+        
+        assert counts["today"] == 2
+        assert counts["by_status"] == [{"status": "scheduled", "count": 4}]
@@ -0,0 +1,169 @@
+"""
+Analytics Service - Keyset Listing Tests
+Test Suite: S5.TS21
+
+Tests the keyset-paginated visit and patient listings: walking every
+page without gaps or repeats, filters, and cursor validation, on a
+SQLite stand-in.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.core import dates
+from app.main import app
+from app.services.listings import (
+    encode_cursor,
+    patient_key,
+    patient_page_query,
+    stream_page,
+    visit_key,
+    visit_page_query,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # Rows are fetched from several executor threads
+    engine = create_engine(f"sqlite:///{tmp_path}/listings.db", connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE patients (id INTEGER PRIMARY KEY, name TEXT, status TEXT, updated_at DATETIME)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, scheduled_time DATETIME)"
+        ))
+        for i in range(1, 8):
+            conn.execute(
+                text("INSERT INTO patients VALUES (:id, :name, :status, :t)"),
+                {"id": i, "name": f"Patient {i}", "status": "critical" if i % 3 == 0 else "stable",
+                 "t": datetime(2026, 3, i)},
+            )
+        # Several visits share a scheduled_time, so ties are broken by id
+        for i in range(1, 24):
+            conn.execute(
+                text("INSERT INTO visits VALUES (:id, 1, :status, :t)"),
+                {"id": i, "status": "missed" if i % 4 == 0 else "completed",
+                 "t": datetime(2026, 3, 1 + i // 5, 9, 0)},
+            )
+        conn.execute(text("INSERT INTO visits VALUES (24, 1, 'completed', NULL)"))
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def fetch_page(session_factory, build, key, limit, **filters):
+    statement, params = build(limit=limit, **filters)
+
+    async def collect():
+        return b"".join([chunk async for chunk in stream_page(statement, params, limit, key, session_factory)])
+
+    return orjson.loads(asyncio.run(collect()))
+
+
+def walk(session_factory, build, key, limit, **filters):
+    rows, cursor, pages = [], None, 0
+    while True:
+        page = fetch_page(session_factory, build, key, limit, cursor=cursor, **filters)
+        assert "error" not in page
+        rows += page["data"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows, pages
+
+
+class TestListings:
+    """S5.TS21: Keyset Listing Tests"""
+
+    def test_visit_pages_cover_every_row_once(self, session_factory):
+        """
+        Test: S5.TS21.1
+        Verify that following next_cursor walks all visits in order
+
+        Expected behavior:
+        - Rows come in (scheduled_time, id) order without repeats
+        - Pages split rows sharing a scheduled_time correctly
+        - The last page has a null next_cursor
+        """
+        rows, pages = walk(session_factory, visit_page_query, visit_key, limit=4)
+
+        ids = [row["id"] for row in rows]
+        assert ids == list(range(1, 24))
+        assert pages == 6
+        keys = [(row["scheduled_time"], row["id"]) for row in rows]
+        assert keys == sorted(keys)
+
+        # A page that ends exactly on the last row has no next page
+        page = fetch_page(session_factory, visit_page_query, visit_key, limit=23)
+        assert len(page["data"]) == 23
+        assert page["next_cursor"] is None
+
+    def test_filters_and_patient_listing(self, session_factory):
+        """
+        Test: S5.TS21.2
+        Verify that status and date filters apply across pages
+
+        Expected behavior:
+        - Visits are limited to the status and [from, to) range
+        - Patients page in id order, filtered by status and updated_at
+        """
+        rows, _ = walk(session_factory, visit_page_query, visit_key, limit=2, status="completed",
+                       start=datetime(2026, 3, 2), end=datetime(2026, 3, 4))
+        assert [row["id"] for row in rows] == [5, 6, 7, 9, 10, 11, 13, 14]
+
+        patients, pages = walk(session_factory, patient_page_query, patient_key, limit=2, status="stable",
+                               start=datetime(2026, 3, 2))
+        assert [p["id"] for p in patients] == [2, 4, 5, 7]
+        assert pages == 2
+        assert patients[0] == {"id": 2, "name": "Patient 2", "status": "stable",
+                               "updated_at": "2026-03-02T00:00:00"}
+
+    def test_invalid_cursor_is_rejected(self):
+        """
+        Test: S5.TS21.3
+        Verify that malformed cursors are reported, not queried
+
+        Expected behavior:
+        - Status code should be 400 with an error and null data
+        - Cursors whose id is not an integer are rejected too
+        - Page sizes above the maximum are rejected with 422
+        """
+        cursors = {
+            "/api/analytics/visits": ["not-a-cursor", encode_cursor(["2026-03-01T09:00:00", "1 OR 1=1"])],
+            "/api/analytics/patients": ["not-a-cursor", encode_cursor([1.5]), encode_cursor([True])],
+        }
+        for path, values in cursors.items():
+            for cursor in values:
+                response = client.get(path, params={"cursor": cursor})
+                assert response.status_code == 400
+                assert response.json() == {"error": "invalid cursor", "data": None}
+
+        response = client.get("/api/analytics/visits", params={"limit": 10 ** 6})
+        assert response.status_code == 422
+
+    def test_offset_aware_bounds_use_facility_time(self, session_factory, monkeypatch):
+        """
+        Test: S5.TS21.4
+        Verify that from/to with an offset filter on facility wall-clock time
+
+        Expected behavior:
+        - A UTC bound is converted to the facility zone before binding
+        - Visits and patients match the naive facility-time range
+        """
+        monkeypatch.setattr(dates, "day_windows", dates.DayWindows("Europe/Berlin"))
+        # 08:00Z is 09:00 in Berlin, when the 2026-03-02 visits are scheduled
+        rows, _ = walk(session_factory, visit_page_query, visit_key, limit=10,
+                       start=datetime(2026, 3, 2, 8, 0, tzinfo=timezone.utc),
+                       end=datetime(2026, 3, 2, 8, 1, tzinfo=timezone.utc))
+        assert [row["id"] for row in rows] == [5, 6, 7, 8, 9]
+
+        patients, _ = walk(session_factory, patient_page_query, patient_key, limit=10,
+                           start=datetime(2026, 3, 1, 23, 0, tzinfo=timezone.utc))
+        assert [p["id"] for p in patients] == [2, 3, 4, 5, 6, 7]
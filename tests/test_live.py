@@ -0,0 +1,132 @@
+"""
+Analytics Service - Live Update Tests
+Test Suite: S5.TS22
+
+Tests the Server-Sent Events push channel: merge-patch diffs, one
+shared producer fanned out to every subscriber, and resyncing clients
+that fall behind.
+"""
+
+import asyncio
+from datetime import date, datetime
+
+import orjson
+from mongomock_motor import AsyncMongoMockClient
+from app.core.dates import DayWindows
+from app.services.live import LiveBroadcaster, format_event, merge_patch, visit_data_today
+
+
+class CountingProducer:
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = 0
+
+    async def __call__(self, mongo_db):
+        self.calls += 1
+        return self.states[min(self.calls, len(self.states)) - 1]
+
+
+def drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class TestLiveUpdates:
+    """S5.TS22: Live Update Tests"""
+
+    def test_merge_patch_diffs_nested_state(self):
+        """
+        Test: S5.TS22.1
+        Verify that patches carry only what changed
+
+        Expected behavior:
+        - Nested objects are diffed key by key
+        - Lists are replaced whole; removed keys become null
+        - Identical states give an empty patch
+        """
+        old = {"overview": {"total_patients": 10, "critical_patients": 2},
+               "visits_by_status": [{"status": "completed", "count": 5}], "stale": 1}
+        new = {"overview": {"total_patients": 10, "critical_patients": 3},
+               "visits_by_status": [{"status": "completed", "count": 6}]}
+
+        assert merge_patch(old, new) == {
+            "overview": {"critical_patients": 3},
+            "visits_by_status": [{"status": "completed", "count": 6}],
+            "stale": None,
+        }
+        assert merge_patch(new, new) == {}
+        assert merge_patch({}, new) == new
+
+    def test_one_producer_call_per_tick_for_all_subscribers(self):
+        """
+        Test: S5.TS22.2
+        Verify that every subscriber gets the same events from one computation
+
+        Expected behavior:
+        - The producer runs once per tick regardless of subscriber count
+        - Unchanged ticks publish nothing
+        - Late subscribers start from a snapshot of the current state
+        """
+        producer = CountingProducer([{"critical": 1}, {"critical": 1}, {"critical": 2}])
+
+        async def scenario():
+            live = LiveBroadcaster(producer, interval=5, min_interval=0, queue_size=8)
+            screens = [live.subscribe() for _ in range(50)]
+            for _ in range(3):
+                await live.tick()
+            late = live.subscribe()
+            return live, screens, late
+
+        live, screens, late = asyncio.run(scenario())
+
+        assert producer.calls == 3
+        expected = [("patch", 1, {"critical": 1}), ("patch", 2, {"critical": 2})]
+        assert all(drain(queue) == expected for queue in screens)
+        assert drain(late) == [("snapshot", 2, {"critical": 2})]
+
+        event = format_event(expected[1])
+        assert event.startswith(b"event: patch\nid: 2\ndata: ")
+        assert orjson.loads(event.split(b"data: ")[1]) == {"critical": 2}
+
+    def test_slow_subscriber_is_resynced(self):
+        """
+        Test: S5.TS22.3
+        Verify that a client whose queue fills up gets a fresh snapshot
+
+        Expected behavior:
+        - The backlog is dropped instead of blocking the producer
+        - The client is left with one snapshot of the latest state
+        """
+        producer = CountingProducer([{"n": i} for i in range(10)])
+
+        async def scenario():
+            live = LiveBroadcaster(producer, interval=5, min_interval=0, queue_size=2)
+            slow = live.subscribe()
+            for _ in range(3):
+                await live.tick()
+            return slow
+
+        slow = asyncio.run(scenario())
+
+        assert drain(slow) == [("snapshot", 3, {"n": 2})]
+
+    def test_visit_data_counts_follow_the_facility_day(self):
+        """
+        Test: S5.TS22.4
+        Verify that live visit_data counts use the facility-timezone day
+
+        Expected behavior:
+        - A visit just after local midnight (the previous UTC day) is counted
+        - A visit at local midnight of the next day is not
+        """
+        window = DayWindows("Europe/Berlin").window(date(2026, 3, 10))
+        db = AsyncMongoMockClient().analytics
+        asyncio.run(db.visit_data.insert_many([
+            {"status": "completed", "scheduledTime": datetime(2026, 3, 9, 23, 30)},  # 00:30 in Berlin
+            {"status": "completed", "scheduledTime": datetime(2026, 3, 10, 12, 0)},
+            {"status": "missed", "scheduledTime": datetime(2026, 3, 10, 23, 0)},  # next Berlin day
+        ]))
+
+        assert asyncio.run(visit_data_today(db, window)) == [{"status": "completed", "count": 2}]
@@ -0,0 +1,108 @@
+"""
+Analytics Service - Metrics Tests
+Test Suite: S5.TS12
+
+Tests the latency instrumentation and the Prometheus /metrics
+endpoint.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from app.core.metrics import MongoCommandTimer, instrument_engine, statement_label
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestMetrics:
+    """S5.TS12: Metrics Tests"""
+    
+    def test_metrics_endpoint_reports_route_latency(self):
+        """
+        Test: S5.TS12.1
+        Verify that requests are recorded per route template
+        
+        Expected behavior:
+        - /metrics returns Prometheus text format
+        - The health route appears with its template and status
+        """
+        client.get("/health")
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'analytics_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    
+    def test_statement_labels_are_normalized(self):
+        """
+        Test: S5.TS12.2
+        Verify that SQL statements are labelled with collapsed whitespace
+        
+        Expected behavior:
+        - Newlines and indentation collapse to single spaces
+        """
+        label = statement_label("""
+            SELECT status, COUNT(*)
+            FROM patients
+            GROUP BY status
+        """)
+        
+        assert label == "SELECT status, COUNT(*) FROM patients GROUP BY status"
+    
+    def test_mongo_listener_records_command_latency(self):
+        """
+        Test: S5.TS12.3
+        Verify that the Mongo command listener records latency per collection
+        
+        Expected behavior:
+        - A succeeded aggregate is observed under its collection name
+        """
+        labels = {"command": "aggregate", "collection": "visit_data", "outcome": "success"}
+        before = REGISTRY.get_sample_value("analytics_mongo_command_duration_seconds_count", labels) or 0
+        
+        timer = MongoCommandTimer()
+        timer.started(SimpleNamespace(
+            command_name="aggregate", command={"aggregate": "visit_data"}, request_id=1, connection_id=("db", 27017)
+        ))
+        timer.succeeded(SimpleNamespace(
+            command_name="aggregate", request_id=1, connection_id=("db", 27017), duration_micros=1500
+        ))
+        
+        after = REGISTRY.get_sample_value("analytics_mongo_command_duration_seconds_count", labels)
+        assert after == before + 1
+    
+    def test_failed_statement_leaves_no_timing_state(self):
+        """
+        Test: S5.TS12.4
+        Verify that a failing statement doesn't skew later timings
+        
+        Expected behavior:
+        - The failed statement is recorded once
+        - No start time is left on its execution context
+        - The next statement on that connection is still observed
+        """
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        contexts = []
+        event.listen(engine, "handle_error", lambda ctx: contexts.append(ctx.execution_context))
+        
+        def count(statement):
+            labels = {"statement": statement}
+            return REGISTRY.get_sample_value("analytics_sql_statement_duration_seconds_count", labels) or 0
+        
+        failed, ok = "SELECT * FROM missing_table", "SELECT 1"
+        before = count(failed), count(ok)
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text(failed))
+            assert conn.execute(text(ok)).scalar() == 1
+        engine.dispose()
+        
+        assert (count(failed), count(ok)) == (before[0] + 1, before[1] + 1)
+        assert len(contexts) == 1 and not hasattr(contexts[0], "_query_started")
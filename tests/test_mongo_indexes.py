@@ -0,0 +1,106 @@
+"""
+Analytics Service - visit_data Index Tests
+Test Suite: S5.TS27
+
+Tests the startup index check for visit_data against a mongomock
+stand-in, and that an unreachable MongoDB never holds up startup.
+"""
+
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from app import main
+from app.core.config import settings
+from app.db import mongo
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    db = AsyncMongoMockClient().analytics
+
+    async def get_mongo_db():
+        return db
+
+    monkeypatch.setattr(mongo, "get_mongo_db", get_mongo_db)
+    return db
+
+
+class UnreachableCollection:
+    """Waits on every call, like a driver still selecting a server"""
+
+    async def index_information(self):
+        await asyncio.Event().wait()
+
+
+class UnreachableDatabase:
+    visit_data = UnreachableCollection()
+
+
+class TestVisitDataIndexes:
+    """S5.TS27: visit_data Index Tests"""
+
+    def test_creates_expected_indexes(self, mongo_db):
+        """
+        Test: S5.TS27.1
+        Verify that every visit_data index is created
+
+        Expected behavior:
+        - Each VISIT_DATA_INDEXES key list exists after the check
+        """
+        asyncio.run(mongo.ensure_visit_data_indexes())
+
+        info = asyncio.run(mongo_db.visit_data.index_information())
+        keys = [index["key"] for index in info.values()]
+        for expected in mongo.VISIT_DATA_INDEXES:
+            assert expected in keys
+
+    def test_second_run_is_idempotent(self, mongo_db):
+        """
+        Test: S5.TS27.2
+        Verify that re-running the check creates nothing new
+
+        Expected behavior:
+        - A pre-existing index under another name counts as present
+        - The second run leaves the index set unchanged
+        """
+        asyncio.run(mongo_db.visit_data.create_index(mongo.VISIT_DATA_INDEXES[0], name="custom_staff_time"))
+        asyncio.run(mongo.ensure_visit_data_indexes())
+        first = asyncio.run(mongo_db.visit_data.index_information())
+        asyncio.run(mongo.ensure_visit_data_indexes())
+        second = asyncio.run(mongo_db.visit_data.index_information())
+
+        assert first == second
+        assert "custom_staff_time" in second
+        assert len(second) == len(mongo.VISIT_DATA_INDEXES) + 1  # plus _id
+
+    def test_unreachable_mongo_does_not_block_startup(self, monkeypatch):
+        """
+        Test: S5.TS27.3
+        Verify that startup completes while MongoDB does not answer
+
+        Expected behavior:
+        - The lifespan yields although the index check is still waiting
+        - Shutdown cancels the pending check
+        """
+        async def get_mongo_db():
+            return UnreachableDatabase()
+
+        monkeypatch.setattr(mongo, "get_mongo_db", get_mongo_db)
+        monkeypatch.setattr(main, "prepare_rollup_tables", lambda: asyncio.sleep(0))
+        monkeypatch.setattr(settings, "MONGO_ENSURE_INDEXES", True)
+        monkeypatch.setattr(settings, "LIVE_ENABLED", False)
+        monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", False)
+
+        async def start_and_stop():
+            lifespan = main.lifespan(main.app)
+            await asyncio.wait_for(lifespan.__aenter__(), 1)
+            pending = [task for task in asyncio.all_tasks() if "ensure_visit_data_indexes" in repr(task)]
+            await lifespan.__aexit__(None, None, None)
+            await asyncio.sleep(0)
+            return pending
+
+        pending = asyncio.run(start_and_stop())
+
+        assert len(pending) == 1
+        assert pending[0].cancelled()
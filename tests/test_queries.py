@@ -0,0 +1,116 @@
+"""
+Analytics Service - Query Registry Tests
+Test Suite: S5.TS25
+
+Tests the shared statement registry: compiled-cache reuse, the legacy
+Flask app and the FastAPI services agreeing on the same statements, on
+a SQLite stand-in.
+"""
+
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import default
+from sqlalchemy.sql.elements import ClauseElement
+from app.core.config import Settings
+from app.core.dates import today_bounds
+from app.db import queries
+from app.db.engine import create_mysql_engine
+from app.services.aggregates import build_dashboard, query_patient_status_counts, query_visit_status_counts
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/queries.db")
+    today_start, today_end = today_bounds()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE patients (id INTEGER PRIMARY KEY, name TEXT, status TEXT, updated_at DATETIME)"))
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, "
+            "scheduled_time DATETIME, updated_at DATETIME)"
+        ))
+        for i, status in enumerate(["Critical", "Critical", "Stable"], start=1):
+            conn.execute(text("INSERT INTO patients (id, status) VALUES (:id, :status)"), {"id": i, "status": status})
+        # Both ends of today's half-open range
+        for i, moment in enumerate([today_start, today_start + timedelta(hours=9), today_end,
+                                    today_start - timedelta(seconds=1)], start=1):
+            conn.execute(text("INSERT INTO visits (id, status, scheduled_time) VALUES (:id, 'completed', :t)"),
+                         {"id": i, "t": moment})
+    yield engine
+    engine.dispose()
+
+
+class TestQueryRegistry:
+    """S5.TS25: Query Registry Tests"""
+
+    def test_statements_reuse_compiled_cache(self, engine):
+        """
+        Test: S5.TS25.1
+        Verify that registry statements are compiled once per engine
+
+        Expected behavior:
+        - Every registry statement has a cache key
+        - The second execution is a compiled-cache hit
+        - The cache size comes from MYSQL_QUERY_CACHE_SIZE
+        """
+        statements = [value for value in vars(queries).values() if isinstance(value, ClauseElement)]
+        statements += [*queries.STATUS_ROWS.values(), *queries.STATUS_ROWS_SINCE.values()]
+        assert statements
+        assert all(statement._generate_cache_key() is not None for statement in statements)
+
+        params = dict(zip(("today_start", "today_end"), today_bounds()))
+        with engine.connect() as conn:
+            first = conn.execute(queries.VISIT_STATUS_AND_TODAY_COUNTS, params)
+            second = conn.execute(queries.VISIT_STATUS_AND_TODAY_COUNTS, params)
+        assert first.context.cache_hit is default.CACHE_MISS
+        assert second.context.cache_hit is default.CACHE_HIT
+
+        sized = create_mysql_engine("sqlite://", Settings(MYSQL_QUERY_CACHE_SIZE=64))
+        assert sized._compiled_cache.capacity == 64
+        sized.dispose()
+
+    def test_flask_and_fastapi_agree(self, engine):
+        """
+        Test: S5.TS25.2
+        Verify that both apps report the same dashboard from shared statements
+
+        Expected behavior:
+        - Flask /dashboard/stats matches the FastAPI dashboard payload
+        - Today's count includes midnight and excludes tomorrow's midnight
+        """
+        spec = importlib.util.spec_from_file_location("flask_app", ROOT / "app.py")
+        flask_app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(flask_app)
+        flask_app.mysql_engine = engine
+
+        response = flask_app.app.test_client().get("/api/analytics/dashboard/stats")
+        assert response.status_code == 200
+
+        with engine.connect() as conn:
+            expected = build_dashboard(query_patient_status_counts(conn), query_visit_status_counts(conn))
+        assert response.get_json()["data"] == expected
+        assert expected["overview"]["today_visits"] == 2
+
+    def test_counter_statements_per_table(self, engine):
+        """
+        Test: S5.TS25.3
+        Verify the per-table status counter statements
+
+        Expected behavior:
+        - Full and delta scans exist for every counter table
+        - The delta scan binds a datetime and returns typed updated_at
+        """
+        assert set(queries.STATUS_ROWS) == set(queries.STATUS_ROWS_SINCE) == set(queries.STATUS_COUNTS)
+
+        since = datetime(2026, 1, 1)
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE patients SET updated_at = :t WHERE id = 1"), {"t": since + timedelta(hours=1)})
+            rows = conn.execute(queries.STATUS_ROWS_SINCE["patients"], {"since": since}).fetchall()
+            counts = dict(conn.execute(queries.STATUS_COUNTS["patients"]).fetchall())
+        assert [(row.id, row.updated_at) for row in rows] == [(1, since + timedelta(hours=1))]
+        assert counts == {"Critical": 2, "Stable": 1}
@@ -0,0 +1,178 @@
+"""
+Analytics Service - Read Replica Tests
+Test Suite: S5.TS26
+
+Tests read-replica routing: round robin over healthy replicas, the lag
+limits, and the fallback to the primary, with SQLite files standing in
+for the replicas.
+"""
+
+import asyncio
+
+import pymysql
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.core.cache import aggregate_cache
+from app.db import mysql
+from app.db.replicas import ReplicaRouter
+from app.services import aggregates
+
+
+def served_by(db):
+    db.execute(text("SELECT 1"))
+    return db.get_bind().url.database
+
+
+def failing_on_replica(code, message):
+    def query(db):
+        served = served_by(db)
+        if "replica" in served:
+            raise OperationalError("SELECT ...", {}, pymysql.err.OperationalError(code, message))
+        return served
+    return query
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    dsns = [f"sqlite:///{tmp_path}/replica{i}.db" for i in (1, 2)]
+    for dsn in dsns:
+        engine = create_engine(dsn)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE patients (id INTEGER PRIMARY KEY, status TEXT)"))
+            conn.execute(text("INSERT INTO patients (status) VALUES ('Critical'), ('Critical'), ('Stable')"))
+        engine.dispose()
+    router = ReplicaRouter(dsns, create_engine, max_lag=30.0, check_interval=10.0)
+    monkeypatch.setattr(mysql, "replicas", router)
+    yield router
+    for replica in router.replicas:
+        replica.engine.dispose()
+
+
+class TestReadReplicas:
+    """S5.TS26: Read Replica Tests"""
+
+    def test_round_robin_over_healthy_replicas(self, router):
+        """
+        Test: S5.TS26.1
+        Verify that reads rotate over replicas that pass their check
+
+        Expected behavior:
+        - No replica gets reads before its first check
+        - Healthy replicas take turns
+        - Replicas past the lag limit are skipped, down to the primary
+        """
+        first, second = router.replicas
+        assert router.choose() is None
+
+        router.check_all()
+        assert first.healthy and first.lag == 0
+        assert {router.choose().name for _ in range(4)} == {first.name, second.name}
+
+        second.lag = 20.0
+        assert [router.choose(max_lag=5.0) for _ in range(2)] == [first, first]
+        first.lag = 40.0
+        assert router.choose() is second
+        assert router.choose(max_lag=5.0) is None
+
+    def test_failed_replica_falls_back_to_primary(self, router, tmp_path):
+        """
+        Test: S5.TS26.2
+        Verify that only a lost connection takes a replica out
+
+        Expected behavior:
+        - Reads go to a replica while one is healthy
+        - A lost connection takes the replica out and retries on the primary
+        - A failed health check keeps it out
+        """
+        router.check_all()
+        router.replicas = router.replicas[:1]
+        replica = router.replicas[0]
+        assert asyncio.run(mysql.run_in_read_session(served_by)).endswith("replica1.db")
+
+        served = asyncio.run(mysql.run_in_read_session(failing_on_replica(2013, "Lost connection")))
+        assert served == mysql.engine.url.database
+        assert not replica.healthy and replica.error
+
+        replica.engine.dispose()
+        replica.engine = create_engine(f"sqlite:///{tmp_path}/missing/replica1.db")
+        replica.sessions.configure(bind=replica.engine)
+
+        router.check(replica)
+        assert not replica.healthy and router.choose() is None
+
+    def test_fresh_counts_skip_lagging_replicas(self, router, monkeypatch):
+        """
+        Test: S5.TS26.3
+        Verify the max-lag guard used by /patients/critical
+
+        Expected behavior:
+        - A replica within the fresh limit answers the critical count
+        - A replica lagging past the limit is skipped for the primary
+        - Concurrent polls share one query
+        """
+        seen = []
+        query = aggregates.query_critical_patients
+
+        def count(db):
+            seen.append(served_by(db))
+            return query(db) if "replica" in seen[-1] else -1
+
+        monkeypatch.setattr(aggregates, "query_critical_patients", count)
+        aggregate_cache.invalidate()
+        router.check_all()
+
+        async def polls():
+            return await asyncio.gather(*(aggregates.critical_patients(max_lag=1.0) for _ in range(5)))
+
+        try:
+            fresh = asyncio.run(polls())
+            aggregate_cache.invalidate()
+            for replica in router.replicas:
+                replica.lag = 5.0
+            lagging = asyncio.run(aggregates.critical_patients(max_lag=1.0))
+        finally:
+            aggregate_cache.invalidate()
+
+        assert fresh == [2] * 5 and lagging == -1
+        assert len(seen) == 2
+        assert "replica" in seen[0] and seen[1] == mysql.engine.url.database
+
+    def test_query_errors_do_not_fail_over(self, router):
+        """
+        Test: S5.TS26.4
+        Verify that a replica error other than a lost connection is re-raised
+
+        Expected behavior:
+        - A lock-wait timeout reaches the caller instead of retrying on the primary
+        - The replica stays healthy and keeps getting reads
+        """
+        router.check_all()
+        router.replicas = router.replicas[:1]
+        replica = router.replicas[0]
+
+        with pytest.raises(OperationalError) as raised:
+            asyncio.run(mysql.run_in_read_session(failing_on_replica(1205, "Lock wait timeout exceeded")))
+
+        assert raised.value.orig.args[0] == 1205
+        assert replica.healthy and router.choose() is replica
+
+    def test_lag_bound_counts_sample_age(self, router):
+        """
+        Test: S5.TS26.5
+        Verify that a lag sample stops proving a limit as it ages
+
+        Expected behavior:
+        - A replica just checked at lag 0.5 serves a 1s fresh read
+        - The same sample 2s later no longer does, but still meets the normal limit
+        """
+        router.check_all()
+        router.replicas = router.replicas[:1]
+        replica = router.replicas[0]
+        replica.lag = 0.5
+        assert router.choose(max_lag=1.0) is replica
+
+        replica.checked_at -= 2.0
+        assert 2.5 <= replica.lag_bound() < 3.0
+        assert router.choose(max_lag=1.0) is None
+        assert router.choose() is replica
@@ -0,0 +1,197 @@
+"""
+Analytics Service - Daily Rollup Tests
+Test Suite: S5.TS17
+
+Tests the daily rollup tables: idempotent re-runs, range queries that
+combine rollups with the raw tail, and staff task rollups, on a SQLite
+stand-in.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+import asyncio
+import logging
+
+import mongomock
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+from app import main
+from app.core.config import settings
+from app.services import rollups
+from app.services.rollups import (
+    ensure_rollup_tables, query_staff_task_rollup, query_visit_daily,
+    rollup_staff_task_day, rollup_visit_day, visit_daily_rollup,
+)
+from app.services.staff_tasks import all_staff_task_summary_pipeline
+
+ROLLED_DAY = date.today() - timedelta(days=3)
+TAIL_DAY = date.today() - timedelta(days=2)
+
+
+def add_visit(db, visit_id, day, status="completed"):
+    db.execute(
+        text("INSERT INTO visits (id, patient_id, status, scheduled_time) VALUES (:id, 1, :status, :t)"),
+        {"id": visit_id, "status": status, "t": datetime.combine(day, time(9, 0))},
+    )
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, scheduled_time DATETIME)"
+        ))
+    ensure_rollup_tables(engine)
+    with Session(engine) as session:
+        add_visit(session, 1, ROLLED_DAY)
+        add_visit(session, 2, ROLLED_DAY, status="missed")
+        add_visit(session, 3, TAIL_DAY)
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+class TestDailyRollups:
+    """S5.TS17: Daily Rollup Tests"""
+    
+    def test_rerunning_a_day_replaces_its_rows(self, db):
+        """
+        Test: S5.TS17.1
+        Verify that rolling up the same day twice is idempotent
+        
+        Expected behavior:
+        - A second run leaves the same number of rows
+        - Visits added in between are picked up by the re-run
+        """
+        assert rollup_visit_day(db, ROLLED_DAY) == 2
+        add_visit(db, 4, ROLLED_DAY)
+        assert rollup_visit_day(db, ROLLED_DAY) == 3
+        
+        rows = db.execute(select(func.count()).select_from(visit_daily_rollup)).scalar()
+        assert rows == 2
+    
+    def test_range_combines_rollup_and_raw_tail(self, db):
+        """
+        Test: S5.TS17.2
+        Verify that rolled-up days come from the rollup, later days from visits
+        
+        Expected behavior:
+        - A visit added to a rolled-up day is not visible until the re-run
+        - Days after the last rollup are counted from the raw table
+        """
+        rollup_visit_day(db, ROLLED_DAY)
+        add_visit(db, 4, ROLLED_DAY)
+        add_visit(db, 5, TAIL_DAY)
+        
+        rows = query_visit_daily(db, ROLLED_DAY, TAIL_DAY + timedelta(days=1))
+        assert rows == [
+            {"day": ROLLED_DAY.isoformat(), "status": "completed", "count": 1},
+            {"day": ROLLED_DAY.isoformat(), "status": "missed", "count": 1},
+            {"day": TAIL_DAY.isoformat(), "status": "completed", "count": 2},
+        ]
+    
+    def test_staff_task_rollup_round_trip(self, db):
+        """
+        Test: S5.TS17.3
+        Verify that per-staff task counters are rolled up from visit_data
+        
+        Expected behavior:
+        - One row per staff member with visits that day
+        - Reading back yields the task summary payload
+        """
+        collection = mongomock.MongoClient().db.visit_data
+        scheduled = datetime.combine(ROLLED_DAY, time(10, 0))
+        collection.insert_many([
+            {"assignedStaffId": "s1", "scheduledTime": scheduled,
+             "tasks": [{"status": "completed"}, {"status": "pending", "priority": "high"}]},
+            {"assignedStaffId": "s2", "scheduledTime": scheduled, "tasks": [{"status": "completed"}]},
+        ])
+        start = datetime.combine(ROLLED_DAY, time.min)
+        summaries = collection.aggregate(all_staff_task_summary_pipeline(start, start + timedelta(days=1)))
+        
+        assert rollup_staff_task_day(db, ROLLED_DAY, summaries) == 2
+        
+        rows, tail_start = query_staff_task_rollup(db, "s1", ROLLED_DAY, TAIL_DAY)
+        assert tail_start == TAIL_DAY
+        assert rows == [{
+            "day": ROLLED_DAY.isoformat(), "totalTasks": 2, "completedTasks": 1, "pendingTasks": 1,
+            "highPriorityPending": 1, "totalVisits": 1, "completionRate": 50.0,
+        }]
+    
+    def test_gaps_are_read_from_raw_rows(self, db):
+        """
+        Test: S5.TS17.4
+        Verify that a day the job skipped is counted from the raw table
+        
+        Expected behavior:
+        - A rolled-up day with no visits still counts as covered
+        - A missing day inside the range is read raw, not reported as zero
+        """
+        empty_day = ROLLED_DAY - timedelta(days=2)
+        gap_day = ROLLED_DAY - timedelta(days=1)
+        add_visit(db, 4, gap_day)
+        assert rollup_visit_day(db, empty_day) == 0
+        rollup_visit_day(db, ROLLED_DAY)
+        
+        rows = query_visit_daily(db, empty_day, TAIL_DAY)
+        assert rows == [
+            {"day": gap_day.isoformat(), "status": "completed", "count": 1},
+            {"day": ROLLED_DAY.isoformat(), "status": "completed", "count": 1},
+            {"day": ROLLED_DAY.isoformat(), "status": "missed", "count": 1},
+        ]
+        
+        _, tail_start = query_staff_task_rollup(db, "s1", empty_day, TAIL_DAY)
+        assert tail_start == empty_day
+    
+    def test_missing_tables_fall_back_to_raw(self, monkeypatch, caplog):
+        """
+        Test: S5.TS17.5
+        Verify that the daily readers work before the rollup tables exist
+        
+        Expected behavior:
+        - Startup runs no rollup DDL unless ROLLUP_CREATE_TABLES is on
+        - /visits/daily counts come from visits when the tables are missing
+        - Staff rollups leave the whole range to the visit_data tail
+        - The missing tables are logged once, not queried per request
+        """
+        created = []
+        
+        async def prepare():
+            created.append(1)
+        
+        monkeypatch.setattr(main, "prepare_rollup_tables", prepare)
+        monkeypatch.setattr(settings, "MONGO_ENSURE_INDEXES", False)
+        monkeypatch.setattr(settings, "LIVE_ENABLED", False)
+        monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", False)
+        
+        async def start_and_stop():
+            async with main.lifespan(main.app):
+                await asyncio.sleep(0)
+        
+        monkeypatch.setattr(settings, "ROLLUP_CREATE_TABLES", False)
+        asyncio.run(start_and_stop())
+        assert created == []
+        monkeypatch.setattr(settings, "ROLLUP_CREATE_TABLES", True)
+        asyncio.run(start_and_stop())
+        assert created == [1]
+        
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, scheduled_time DATETIME)"
+            ))
+        with Session(engine) as db:
+            add_visit(db, 1, ROLLED_DAY)
+            db.commit()
+            with caplog.at_level(logging.INFO, logger=rollups.__name__):
+                rows = query_visit_daily(db, ROLLED_DAY, TAIL_DAY)
+                staff_rows, tail_start = query_staff_task_rollup(db, "s1", ROLLED_DAY, TAIL_DAY)
+                assert query_visit_daily(db, ROLLED_DAY, TAIL_DAY) == rows
+        engine.dispose()
+        
+        assert [record.levelno for record in caplog.records] == [logging.INFO]
+        
+        assert rows == [{"day": ROLLED_DAY.isoformat(), "status": "completed", "count": 1}]
+        assert (staff_rows, tail_start) == ([], ROLLED_DAY)
@@ -0,0 +1,95 @@
+"""
+Analytics Service - JSON Serialization Tests
+Test Suite: S5.TS20
+
+Tests the orjson-based serialization shared by the FastAPI app and the
+legacy Flask app: Mongo and MySQL value types and the default response
+class.
+"""
+
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+from app.core.serialization import ORJSONResponse, dumps
+from app.db.mongo import get_mongo_db
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestSerialization:
+    """S5.TS20: JSON Serialization Tests"""
+    
+    def test_dumps_handles_database_types(self):
+        """
+        Test: S5.TS20.1
+        Verify that Mongo and MySQL value types serialize without conversion
+        
+        Expected behavior:
+        - ObjectId becomes its hex string
+        - Naive datetimes and dates use ISO 8601
+        - Decimal sums become ints when integral, floats otherwise
+        """
+        oid = ObjectId()
+        body = dumps({
+            "_id": oid,
+            "scheduledTime": datetime(2026, 3, 2, 9, 15),
+            "day": date(2026, 3, 2),
+            "total": Decimal("12"),
+            "rate": Decimal("12.5"),
+        })
+        
+        assert orjson.loads(body) == {
+            "_id": str(oid),
+            "scheduledTime": "2026-03-02T09:15:00",
+            "day": "2026-03-02",
+            "total": 12,
+            "rate": 12.5,
+        }
+    
+    def test_app_uses_orjson_response_class(self):
+        """
+        Test: S5.TS20.2
+        Verify that the app renders responses through orjson by default
+        
+        Expected behavior:
+        - The app's default response class is ORJSONResponse
+        - Bodies are compact JSON
+        """
+        response = client.get("/health")
+        
+        assert app.router.default_response_class is ORJSONResponse
+        assert response.content == b'{"status":"ok","service":"analytics-service"}'
+    
+    def test_staff_visits_serialize_raw_documents(self):
+        """
+        Test: S5.TS20.3
+        Verify that raw Mongo documents are returned without manual conversion
+        
+        Expected behavior:
+        - _id is a string and scheduledTime an ISO timestamp
+        """
+        db = AsyncMongoMockClient().analytics
+        scheduled = datetime.now().replace(microsecond=0)
+        asyncio.run(db.visit_data.insert_one(
+            {"assignedStaffId": "s1", "scheduledTime": scheduled, "patientName": "A"}
+        ))
+        
+        async def override():
+            return db
+        
+        app.dependency_overrides[get_mongo_db] = override
+        try:
+            response = client.get("/api/analytics/staff/s1/visits/today")
+        finally:
+            app.dependency_overrides.pop(get_mongo_db, None)
+        
+        visit = response.json()["data"][0]
+        assert isinstance(visit["_id"], str) and len(visit["_id"]) == 24
+        assert visit["scheduledTime"] == scheduled.isoformat()
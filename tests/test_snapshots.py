@@ -0,0 +1,137 @@
+"""
+Analytics Service - Payload Snapshot Tests
+Test Suite: S5.TS14
+
+Tests the background snapshots behind /dashboard/stats and /performance:
+serving stored bytes while fresh and falling back to a live computation.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services import counters
+from app.services.counters import StatusCounter
+from app.services.snapshots import SnapshotScheduler, payload_snapshots
+
+client = TestClient(app)
+
+
+class TestPayloadSnapshots:
+    """S5.TS14: Payload Snapshot Tests"""
+    
+    def test_fresh_snapshot_skips_producer(self):
+        """
+        Test: S5.TS14.1
+        Verify that a fresh snapshot is served without recomputing
+        
+        Expected behavior:
+        - refresh runs the producer once
+        - fresh returns the stored snapshot afterwards
+        """
+        scheduler = SnapshotScheduler(interval=60, max_age=60)
+        calls = []
+        
+        async def producer():
+            calls.append(1)
+            return {"total": len(calls)}, datetime.now(timezone.utc)
+        
+        scheduler.register("p", producer)
+        assert scheduler.fresh("p") is None
+        snapshot = asyncio.run(scheduler.refresh("p"))
+        
+        assert scheduler.fresh("p") is snapshot
+        assert json.loads(snapshot.body)["data"] == {"total": 1}
+        assert len(calls) == 1
+    
+    def test_stale_snapshot_is_not_served(self):
+        """
+        Test: S5.TS14.2
+        Verify that snapshots older than max_age are bypassed
+        
+        Expected behavior:
+        - fresh returns None once max_age is exceeded
+        """
+        scheduler = SnapshotScheduler(interval=60, max_age=0)
+        
+        async def producer():
+            return {}, datetime.now(timezone.utc)
+        
+        scheduler.register("p", producer)
+        asyncio.run(scheduler.refresh("p"))
+        
+        assert scheduler.fresh("p") is None
+    
+    def test_dashboard_reports_generation_time(self):
+        """
+        Test: S5.TS14.3
+        Verify that the dashboard payload carries its generation time
+        
+        Expected behavior:
+        - Response includes generated_at alongside data
+        - A second request within max_age returns the same snapshot
+        """
+        first = client.get("/api/analytics/dashboard/stats").json()
+        second = client.get("/api/analytics/dashboard/stats").json()
+        
+        assert "generated_at" in first
+        assert "overview" in first["data"]
+        assert second["generated_at"] == first["generated_at"]
+    
+    def test_disabled_snapshots_are_always_live(self, monkeypatch):
+        """
+        Test: S5.TS14.4
+        Verify that SNAPSHOT_ENABLED=false serves every request live
+        
+        Expected behavior:
+        - refresh returns the payload without storing it
+        - Each dashboard request is computed anew
+        """
+        monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", False)
+        scheduler = SnapshotScheduler(interval=60, max_age=60)
+        calls = []
+        
+        async def producer():
+            calls.append(1)
+            return {"total": len(calls)}, datetime.now(timezone.utc)
+        
+        scheduler.register("p", producer)
+        snapshot = asyncio.run(scheduler.refresh("p"))
+        
+        assert json.loads(snapshot.body)["data"] == {"total": 1}
+        assert scheduler.fresh("p") is None
+        
+        first = client.get("/api/analytics/dashboard/stats").json()
+        second = client.get("/api/analytics/dashboard/stats").json()
+        assert "overview" in first["data"]
+        assert second["generated_at"] != first["generated_at"]
+    
+    def test_generation_time_is_when_data_was_read(self, monkeypatch):
+        """
+        Test: S5.TS14.5
+        Verify that generated_at reflects the data, not the serialization
+        
+        Expected behavior:
+        - A snapshot built from counters carries their last sync time
+        - Without counters it carries the time of the read
+        """
+        synced_at = datetime.now(timezone.utc) - timedelta(seconds=10)
+        monkeypatch.setattr(settings, "STATUS_COUNTERS_ENABLED", True)
+        for table in counters.status_counters:
+            counter = StatusCounter(table)
+            counter.seed([(1, "Critical")], synced_at=synced_at)
+            monkeypatch.setitem(counters.status_counters, table, counter)
+        
+        before = datetime.now(timezone.utc)
+        snapshot = asyncio.run(payload_snapshots.refresh("dashboard"))
+        assert snapshot.generated_at == synced_at
+        assert json.loads(snapshot.body)["generated_at"] == synced_at.isoformat()
+        assert json.loads(snapshot.body)["data"]["overview"]["critical_patients"] == 1
+        
+        monkeypatch.setattr(settings, "STATUS_COUNTERS_ENABLED", False)
+        snapshot = asyncio.run(payload_snapshots.refresh("dashboard"))
+        assert before <= snapshot.generated_at <= datetime.now(timezone.utc)
@@ -0,0 +1,156 @@
+"""
+Analytics Service - Staff Task Range Tests
+Test Suite: S5.TS23
+
+Tests task summaries over a date range: settled past days aggregated
+once into the per-day cache, recent days and today computed live, against
+a mongomock stand-in.
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+from app.db.mongo import get_mongo_db
+from app.main import app
+from app.services.staff_days import StaffDayCache, staff_task_range
+
+client = TestClient(app)
+
+TODAY = date(2026, 3, 10)
+
+
+def visit(day, hour, tasks, staff="s1"):
+    return {"assignedStaffId": staff, "scheduledTime": datetime.combine(day, time(hour)), "tasks": tasks}
+
+
+DONE = {"status": "completed", "priority": "low"}
+OPEN_HIGH = {"status": "pending", "priority": "high"}
+
+
+@pytest.fixture
+def mongo_db():
+    db = AsyncMongoMockClient().analytics
+    asyncio.run(db.visit_data.insert_many([
+        visit(TODAY - timedelta(days=3), 9, [DONE, DONE]),
+        visit(TODAY - timedelta(days=3), 14, [OPEN_HIGH]),
+        visit(TODAY - timedelta(days=1), 9, [DONE, OPEN_HIGH]),
+        visit(TODAY, 8, [DONE]),
+        visit(TODAY - timedelta(days=1), 9, [DONE], staff="s2"),
+    ]))
+    return db
+
+
+class TestStaffTaskRange:
+    """S5.TS23: Staff Task Range Tests"""
+
+    def test_range_merges_past_days_with_today(self, mongo_db):
+        """
+        Test: S5.TS23.1
+        Verify that a range sums cached past days and the live today slice
+
+        Expected behavior:
+        - Counters cover every day in [from, to) for the staff member only
+        - Every settled past day is cached, including days without visits
+        """
+        cache = StaffDayCache("staff_task_day_cache")
+        summary = asyncio.run(staff_task_range(
+            mongo_db, "s1", TODAY - timedelta(days=6), TODAY + timedelta(days=1), cache=cache, today=TODAY))
+
+        assert summary == {
+            "from": "2026-03-04", "to": "2026-03-11",
+            "totalTasks": 6, "completedTasks": 4, "pendingTasks": 2,
+            "highPriorityPending": 2, "totalVisits": 4, "completionRate": 66.7,
+        }
+        cached = asyncio.run(cache.load(mongo_db, "s1", TODAY - timedelta(days=30), TODAY + timedelta(days=1)))
+        assert sorted(cached) == [TODAY - timedelta(days=d) for d in range(6, 2, -1)]
+        assert cached[TODAY - timedelta(days=4)]["totalVisits"] == 0
+
+    def test_cached_days_are_not_recomputed(self, mongo_db):
+        """
+        Test: S5.TS23.2
+        Verify that past days are read from the cache on later requests
+
+        Expected behavior:
+        - Late writes to a cached past day do not change the summary
+        - Writes to today are picked up live
+        - Widening the range only aggregates the new days
+        """
+        cache = StaffDayCache("staff_task_day_cache")
+        week = (TODAY - timedelta(days=6), TODAY + timedelta(days=1))
+        first = asyncio.run(staff_task_range(mongo_db, "s1", *week, cache=cache, today=TODAY))
+
+        asyncio.run(mongo_db.visit_data.insert_many([
+            visit(TODAY - timedelta(days=3), 18, [DONE]),
+            visit(TODAY, 18, [OPEN_HIGH]),
+            visit(TODAY - timedelta(days=8), 9, [DONE]),
+        ]))
+        second = asyncio.run(staff_task_range(mongo_db, "s1", *week, cache=cache, today=TODAY))
+        assert second["totalTasks"] == first["totalTasks"] + 1
+        assert second["highPriorityPending"] == first["highPriorityPending"] + 1
+
+        wider = asyncio.run(staff_task_range(
+            mongo_db, "s1", TODAY - timedelta(days=9), TODAY + timedelta(days=1), cache=cache, today=TODAY))
+        assert wider["totalTasks"] == second["totalTasks"] + 1
+
+    def test_staff_tasks_endpoint(self, mongo_db):
+        """
+        Test: S5.TS23.3
+        Verify the /staff/{id}/tasks endpoint
+
+        Expected behavior:
+        - A past range returns the summary for that range
+        - Ranges longer than STAFF_TASKS_MAX_DAYS are reported as errors
+        """
+        async def override():
+            return mongo_db
+
+        app.dependency_overrides[get_mongo_db] = override
+        try:
+            response = client.get("/api/analytics/staff/s1/tasks",
+                                  params={"from": "2026-03-07", "to": "2026-03-08"})
+            assert response.status_code == 200
+            data = response.json()["data"]
+            assert data["totalTasks"] == 3
+            assert data["completionRate"] == 66.7
+
+            response = client.get("/api/analytics/staff/s1/tasks",
+                                  params={"from": "2020-01-01", "to": "2026-01-01"})
+            assert response.json()["data"] is None
+            assert "STAFF_TASKS_MAX_DAYS" in response.json()["error"]
+        finally:
+            app.dependency_overrides.pop(get_mongo_db, None)
+
+    def test_recent_days_stay_live(self, mongo_db):
+        """
+        Test: S5.TS23.4
+        Verify the settle window and reversed ranges
+
+        Expected behavior:
+        - Tasks charted late for yesterday show up on the next request
+        - Days inside the settle window are never stored
+        - from after to returns 400
+        """
+        cache = StaffDayCache("staff_task_day_cache")
+        week = (TODAY - timedelta(days=6), TODAY + timedelta(days=1))
+        first = asyncio.run(staff_task_range(mongo_db, "s1", *week, cache=cache, today=TODAY, settle_days=2))
+
+        asyncio.run(mongo_db.visit_data.insert_one(visit(TODAY - timedelta(days=1), 23, [DONE])))
+        second = asyncio.run(staff_task_range(mongo_db, "s1", *week, cache=cache, today=TODAY, settle_days=2))
+        assert second["completedTasks"] == first["completedTasks"] + 1
+        cached = asyncio.run(cache.load(mongo_db, "s1", TODAY - timedelta(days=2), TODAY))
+        assert cached == {}
+
+        async def override():
+            return mongo_db
+
+        app.dependency_overrides[get_mongo_db] = override
+        try:
+            response = client.get("/api/analytics/staff/s1/tasks",
+                                  params={"from": "2026-03-08", "to": "2026-03-07"})
+        finally:
+            app.dependency_overrides.pop(get_mongo_db, None)
+        assert response.status_code == 400
+        assert response.json() == {"error": "from must not be after to", "data": None}
@@ -0,0 +1,115 @@
+"""
+Analytics Service - Staff Task Tests
+Test Suite: S5.TS10
+
+Tests the server-side task summary aggregation used by the staff
+endpoints against a mongomock stand-in.
+"""
+
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.staff_tasks import batch_task_summary_pipeline, task_summary, task_summary_pipeline
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def visit_data():
+    collection = mongomock.MongoClient().analytics.visit_data
+    now = datetime.now()
+    collection.insert_many([
+        {"assignedStaffId": "s1", "scheduledTime": now, "tasks": [
+            {"status": "completed", "priority": "high"},
+            {"status": "pending", "priority": "high"},
+            {"status": "pending", "priority": "low"},
+        ]},
+        {"assignedStaffId": "s1", "scheduledTime": now},
+        {"assignedStaffId": "s1", "scheduledTime": now - timedelta(days=2), "tasks": [
+            {"status": "pending", "priority": "high"},
+        ]},
+        {"assignedStaffId": "s2", "scheduledTime": now, "tasks": [
+            {"status": "completed", "priority": "low"},
+        ]},
+    ])
+    return collection
+
+
+class TestStaffTasks:
+    """S5.TS10: Staff Task Tests"""
+    
+    def test_summary_counts_tasks_server_side(self, visit_data):
+        """
+        Test: S5.TS10.1
+        Verify that the aggregation returns a single document of counters
+        
+        Expected behavior:
+        - Only the staff member's visits in the range are counted
+        - Visits without tasks still count as visits
+        """
+        start = datetime.now() - timedelta(hours=1)
+        result = list(visit_data.aggregate(task_summary_pipeline("s1", start, start + timedelta(hours=2))))
+        
+        assert len(result) == 1
+        assert task_summary(result[0]) == {
+            "totalTasks": 3,
+            "completedTasks": 1,
+            "pendingTasks": 2,
+            "highPriorityPending": 1,
+            "totalVisits": 2,
+            "completionRate": 33.3
+        }
+    
+    def test_summary_without_visits_is_zero(self, visit_data):
+        """
+        Test: S5.TS10.2
+        Verify that a staff member with no visits gets zeroed counters
+        
+        Expected behavior:
+        - The payload has every counter set to zero
+        """
+        start = datetime.now() - timedelta(hours=1)
+        result = list(visit_data.aggregate(task_summary_pipeline("nobody", start, start + timedelta(hours=2))))
+        
+        assert task_summary(result[0] if result else None) == {
+            "totalTasks": 0,
+            "completedTasks": 0,
+            "pendingTasks": 0,
+            "highPriorityPending": 0,
+            "totalVisits": 0,
+            "completionRate": 0
+        }
+    
+    def test_batch_summary_groups_by_staff(self, visit_data):
+        """
+        Test: S5.TS10.3
+        Verify that the batch aggregation returns one summary per staff member
+        
+        Expected behavior:
+        - Each requested staff member with visits gets its own counters
+        - Counters match the single-staff aggregation
+        """
+        start = datetime.now() - timedelta(hours=1)
+        end = start + timedelta(hours=2)
+        result = list(visit_data.aggregate(batch_task_summary_pipeline(["s1", "s2", "s3"], start, end)))
+        by_staff = {doc["_id"]: task_summary(doc) for doc in result}
+        
+        assert set(by_staff) == {"s1", "s2"}
+        single = list(visit_data.aggregate(task_summary_pipeline("s1", start, end)))
+        assert by_staff["s1"] == task_summary(single[0])
+        assert by_staff["s2"]["completedTasks"] == 1
+    
+    def test_batch_endpoint_requires_staff_ids(self):
+        """
+        Test: S5.TS10.4
+        Verify that the batch endpoint validates its request body
+        
+        Expected behavior:
+        - An empty staffIds list is rejected with 422
+        """
+        response = client.post("/api/analytics/staff/tasks/today", json={"staffIds": []})
+        
+        assert response.status_code == 422
@@ -0,0 +1,153 @@
+"""
+Analytics Service - Staff Visit Tests
+Test Suite: S5.TS11
+
+Tests the staff visit endpoints ported from the Flask app and the
+visit_data field mapping, against a mongomock stand-in.
+"""
+
+import asyncio
+import importlib.util
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import mongomock
+import pytest
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+from app.db.mongo import get_mongo_db
+from app.db.visit_fields import FLASK_FIELDS
+from app.main import app
+from app.services.staff_tasks import task_summary, task_summary_pipeline
+
+client = TestClient(app)
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def mongo_db():
+    db = AsyncMongoMockClient().analytics
+    now = datetime.now()
+    asyncio.run(db.visit_data.insert_many([
+        {"assignedStaffId": "s1", "scheduledTime": now, "patientName": "A", "tasks": [
+            {"taskTitle": "Vitals", "status": "completed", "priority": "high", "notes": "long notes"},
+        ]},
+        {"assignedStaffId": "s1", "scheduledTime": now - timedelta(days=1), "patientName": "B"},
+        {"assignedStaffId": "s2", "scheduledTime": now, "patientName": "C"},
+    ]))
+    
+    async def override():
+        return db
+    
+    app.dependency_overrides[get_mongo_db] = override
+    yield db
+    app.dependency_overrides.pop(get_mongo_db, None)
+
+
+class TestStaffVisits:
+    """S5.TS11: Staff Visit Tests"""
+    
+    def test_staff_visits_today_returns_projected_visits(self, mongo_db):
+        """
+        Test: S5.TS11.1
+        Verify that today's visits for a staff member are returned with task details
+        
+        Expected behavior:
+        - Only today's visits for the staff member are returned
+        - _id is a string and unprojected task fields are dropped
+        """
+        response = client.get("/api/analytics/staff/s1/visits/today")
+        
+        assert response.status_code == 200
+        visits = response.json()["data"]
+        assert len(visits) == 1
+        assert isinstance(visits[0]["_id"], str)
+        assert visits[0]["patientName"] == "A"
+        assert "notes" not in visits[0]["tasks"][0]
+    
+    def test_visits_stream_emits_ndjson(self, mongo_db):
+        """
+        Test: S5.TS11.2
+        Verify that the visit stream emits one JSON document per line
+        
+        Expected behavior:
+        - Content type is application/x-ndjson
+        - Each line parses as a visit; the staff filter is honored
+        - Only ?staffId= filters the all-staff route; the staff route uses its path
+        """
+        response = client.get("/api/analytics/visits/today/stream")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert {v["assignedStaffId"] for v in lines} == {"s1", "s2"}
+        
+        response = client.get("/api/analytics/visits/today/stream", params={"staffId": "s2"})
+        assert [json.loads(line)["patientName"] for line in response.text.splitlines()] == ["C"]
+        
+        response = client.get("/api/analytics/visits/today/stream", params={"staff_id": "s2"})
+        assert {json.loads(line)["assignedStaffId"] for line in response.text.splitlines()} == {"s1", "s2"}
+        response = client.get("/api/analytics/staff/s1/visits/today/stream", params={"staffId": "s2"})
+        assert {json.loads(line)["assignedStaffId"] for line in response.text.splitlines()} == {"s1"}
+    
+    def test_flask_field_mapping(self):
+        """
+        Test: S5.TS11.3
+        Verify that the task summary works on the legacy Flask schema
+        
+        Expected behavior:
+        - nurseId / taskCompletions / completed=true documents are counted
+        """
+        collection = mongomock.MongoClient().analytics.visit_data
+        now = datetime.now()
+        collection.insert_one({"nurseId": "n1", "scheduledTime": now, "taskCompletions": [
+            {"completed": True, "priority": "low"},
+            {"completed": False, "priority": "high"},
+        ]})
+        
+        start = now - timedelta(hours=1)
+        pipeline = task_summary_pipeline("n1", start, start + timedelta(hours=2), fields=FLASK_FIELDS)
+        result = list(collection.aggregate(pipeline))
+        
+        summary = task_summary(result[0])
+        assert summary["completedTasks"] == 1
+        assert summary["highPriorityPending"] == 1
+        assert summary["completionRate"] == 50.0
+    
+    def test_flask_stream_matches_listing(self):
+        """
+        Test: S5.TS11.4
+        Verify that the Flask NDJSON stream matches its non-streamed listing
+        
+        Expected behavior:
+        - Every line parses as JSON; no error line is emitted
+        - The staff stream returns the same visits as /visits/today, plus nurseId
+        - The all-staff stream covers every nurse's visits today
+        """
+        spec = importlib.util.spec_from_file_location("flask_app", ROOT / "app.py")
+        flask_app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(flask_app)
+        flask_app.mongo_db = mongomock.MongoClient().analytics
+        now = datetime.now().replace(microsecond=0)
+        flask_app.mongo_db.visit_data.insert_many([
+            {"nurseId": "n1", "scheduledTime": now, "patientName": "A",
+             "taskCompletions": [{"taskTitle": "Vitals", "completed": True, "notes": "long notes"}]},
+            {"nurseId": "n1", "scheduledTime": now + timedelta(seconds=1), "patientName": "B"},
+            {"nurseId": "n1", "scheduledTime": now - timedelta(days=1), "patientName": "old"},
+            {"nurseId": "n2", "scheduledTime": now, "patientName": "C"},
+        ])
+        flask_client = flask_app.app.test_client()
+        
+        listed = flask_client.get("/api/analytics/staff/n1/visits/today").get_json()["data"]
+        response = flask_client.get("/api/analytics/staff/n1/visits/today/stream")
+        
+        assert response.mimetype == "application/x-ndjson"
+        streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert all("error" not in visit for visit in streamed)
+        assert [visit.pop("nurseId") for visit in streamed] == ["n1", "n1"]
+        assert streamed == listed
+        
+        response = flask_client.get("/api/analytics/visits/today/stream")
+        names = [json.loads(line)["patientName"] for line in response.get_data(as_text=True).splitlines()]
+        assert sorted(names) == ["A", "B", "C"]
@@ -0,0 +1,181 @@
+"""
+Analytics Service - Visit Time-Series Tests
+Test Suite: S5.TS16
+
+Tests bucketed visit counts over scheduled_time: bucket alignment,
+empty buckets, and the cache of settled buckets, on a SQLite stand-in.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.core.dates import DayWindows
+from app.db import mysql
+from app.main import app
+from app.services import timeseries
+from app.services.timeseries import ClosedBucketCache, build_visit_timeseries
+
+client = TestClient(app)
+
+
+def add_visit(db, visit_id, scheduled_time, status="completed"):
+    db.execute(
+        text("INSERT INTO visits (id, patient_id, status, scheduled_time) VALUES (:id, 1, :status, :t)"),
+        {"id": visit_id, "status": status, "t": scheduled_time},
+    )
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE visits (id INTEGER PRIMARY KEY, patient_id INTEGER, status TEXT, scheduled_time DATETIME)"
+        ))
+    with Session(engine) as session:
+        add_visit(session, 1, datetime(2026, 3, 2, 9, 15))
+        add_visit(session, 2, datetime(2026, 3, 2, 9, 45), status="missed")
+        add_visit(session, 3, datetime(2026, 3, 4, 14, 0))
+        add_visit(session, 4, datetime(2026, 3, 9, 8, 0))
+        yield session
+    engine.dispose()
+
+
+class TestVisitTimeseries:
+    """S5.TS16: Visit Time-Series Tests"""
+    
+    def test_day_buckets_include_empty_days(self, db):
+        """
+        Test: S5.TS16.1
+        Verify that every day in range is returned, with zeros for gaps
+        
+        Expected behavior:
+        - One entry per day, in order
+        - Status filter narrows the counts
+        """
+        rows = build_visit_timeseries(
+            db, datetime(2026, 3, 2), datetime(2026, 3, 5), "day",
+            now=datetime(2026, 4, 1), cache=ClosedBucketCache(100),
+        )
+        assert rows == [
+            {"bucket": "2026-03-02T00:00:00", "count": 2},
+            {"bucket": "2026-03-03T00:00:00", "count": 0},
+            {"bucket": "2026-03-04T00:00:00", "count": 1},
+        ]
+        
+        missed = build_visit_timeseries(
+            db, datetime(2026, 3, 2), datetime(2026, 3, 3), "day", status="missed",
+            now=datetime(2026, 4, 1), cache=ClosedBucketCache(100),
+        )
+        assert missed == [{"bucket": "2026-03-02T00:00:00", "count": 1}]
+    
+    def test_week_buckets_start_on_monday(self, db):
+        """
+        Test: S5.TS16.2
+        Verify that week buckets align to Monday and widen the range
+        
+        Expected behavior:
+        - A mid-week from is widened to the Monday
+        - Counts match the visits in each week
+        """
+        rows = build_visit_timeseries(
+            db, datetime(2026, 3, 4, 12, 0), datetime(2026, 3, 16), "week",
+            now=datetime(2026, 4, 1), cache=ClosedBucketCache(100),
+        )
+        assert rows == [
+            {"bucket": "2026-03-02T00:00:00", "count": 3},
+            {"bucket": "2026-03-09T00:00:00", "count": 1},
+        ]
+    
+    def test_only_open_buckets_are_recomputed(self, db):
+        """
+        Test: S5.TS16.3
+        Verify that closed buckets come from the cache and open ones are live
+        
+        Expected behavior:
+        - A visit added to a closed bucket is not reflected (cached)
+        - A visit added to the open bucket is reflected
+        """
+        cache = ClosedBucketCache(100)
+        now = datetime(2026, 3, 9, 12, 0)
+        build_visit_timeseries(db, datetime(2026, 3, 8), datetime(2026, 3, 10), "day", now=now, cache=cache, settle=0)
+        
+        add_visit(db, 5, datetime(2026, 3, 8, 10, 0))
+        add_visit(db, 6, datetime(2026, 3, 9, 10, 0))
+        rows = build_visit_timeseries(db, datetime(2026, 3, 8), datetime(2026, 3, 10), "day", now=now, cache=cache,
+                                      settle=0)
+        
+        assert rows == [
+            {"bucket": "2026-03-08T00:00:00", "count": 0},
+            {"bucket": "2026-03-09T00:00:00", "count": 2},
+        ]
+        assert len(cache) == 1
+    
+    def test_cache_waits_for_buckets_to_settle(self, db, monkeypatch):
+        """
+        Test: S5.TS16.4
+        Verify the settle window, the TTL and the replica lag guard
+        
+        Expected behavior:
+        - Closed buckets inside the settle window are recomputed
+        - Expired entries are recomputed
+        - Nothing is cached while the replica's lag is unknown
+        """
+        now = datetime(2026, 3, 10, 12, 0)
+        span = (datetime(2026, 3, 8), datetime(2026, 3, 10))
+        cache = ClosedBucketCache(100)
+        build_visit_timeseries(db, *span, "day", now=now, cache=cache, settle=2 * 86400)
+        assert len(cache) == 0
+        build_visit_timeseries(db, *span, "day", now=now, cache=cache, settle=86400)
+        assert len(cache) == 1  # 03-08 ended 36h ago; 03-09 only 12h ago
+        
+        expiring = ClosedBucketCache(100, ttl=0)
+        build_visit_timeseries(db, *span, "day", now=now, cache=expiring, settle=0)
+        add_visit(db, 5, datetime(2026, 3, 8, 10, 0))
+        rows = build_visit_timeseries(db, *span, "day", now=now, cache=expiring, settle=0)
+        assert rows[0] == {"bucket": "2026-03-08T00:00:00", "count": 1}
+        
+        monkeypatch.setattr(timeseries, "session_lag", lambda session: None)
+        unknown_lag = ClosedBucketCache(100)
+        build_visit_timeseries(db, *span, "day", now=now, cache=unknown_lag, settle=0)
+        assert len(unknown_lag) == 0
+        
+        monkeypatch.setattr(mysql, "replicas", SimpleNamespace(lag_of=lambda bind: 30 * 3600.0))
+        monkeypatch.setattr(timeseries, "session_lag", mysql.session_lag)
+        lagging = ClosedBucketCache(100)
+        build_visit_timeseries(db, *span, "day", now=now, cache=lagging, settle=0)
+        assert len(lagging) == 1  # 03-09 ended 12h ago, within the 30h lag
+    
+    def test_offsets_and_reversed_ranges(self):
+        """
+        Test: S5.TS16.5
+        Verify that from/to with an offset work and a reversed range is rejected
+        
+        Expected behavior:
+        - Offsets are converted to facility time before bucketing
+        - from after to returns 400 with an error body
+        """
+        berlin = DayWindows("Europe/Berlin")
+        assert berlin.local(datetime(2026, 10, 17, 22, 30, tzinfo=timezone.utc)) == datetime(2026, 10, 18, 0, 30)
+        assert berlin.local(datetime(2026, 10, 17, 22, 30)) == datetime(2026, 10, 17, 22, 30)
+        
+        for bucket in ("hour", "day", "week"):
+            response = client.get("/api/analytics/visits/timeseries", params={
+                "bucket": bucket, "from": "2026-10-17T00:00:00Z", "to": "2026-10-17T03:00:00+02:00",
+            })
+            assert response.status_code == 200
+            body = response.json()
+            assert "error" not in body
+            assert body["data"][0]["bucket"] == {
+                "hour": "2026-10-17T00:00:00", "day": "2026-10-17T00:00:00", "week": "2026-10-12T00:00:00",
+            }[bucket]
+        
+        response = client.get("/api/analytics/visits/timeseries", params={
+            "from": "2026-10-17T00:00:00Z", "to": "2026-10-16T00:00:00Z",
+        })
+        assert response.status_code == 400
+        assert response.json() == {"error": "from must not be after to", "data": None}